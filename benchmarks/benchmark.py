@@ -0,0 +1,206 @@
+"""
+End-to-end performance benchmark against the offline FakeGoogleApi server.
+
+Measures form-build time and API calls per form (cold and with a warm header image
+cache), then distribution throughput and peak Python memory for synthetic recipient
+lists of increasing size. Nothing touches Google: a throwaway token is written to a
+temporary directory and every client is pointed at the local fake.
+
+    python benchmarks/benchmark.py [--sizes 10,100,1000,10000,100000] [--mode batch|single]
+                                   [--latency 0.05] [--failure-rate 0.01] [--quota gmail=250]
+                                   [--json results.json] [--baseline results.json --tolerance 0.25]
+
+With --baseline the run exits nonzero when any metric is worse than the baseline by
+more than the tolerance (a fraction).
+"""
+import argparse
+import contextlib
+import datetime
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# The benchmark is not part of the installed package; run it from a checkout
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fake_google_api import FakeGoogleApi
+
+# Metrics where a larger value is better; all others are costs
+HIGHER_IS_BETTER = ("emails_per_second",)
+
+
+def write_fake_token(path, scopes):
+    """
+    Writes an authorized-user token that stays valid for the whole run, so the
+    credential manager never starts an OAuth flow or refreshes against Google.
+    """
+    expiry = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(days=365)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({
+            "token": "benchmark-token",
+            "refresh_token": "benchmark-refresh-token",
+            "client_id": "benchmark.apps.googleusercontent.com",
+            "client_secret": "benchmark-secret",
+            "scopes": scopes,
+            "expiry": expiry.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        }, f)
+
+
+def write_recipients(path, size):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write("institution,contact_name,emails\n")
+        for i in range(size):
+            f.write(f"Institution {i},Contact {i},contact{i}@bank{i % 97}.example.org\n")
+
+
+def bench_form_build(api, token_path):
+    from caricom_central_bank_survey import CentralBankGoogleFormGenerator
+
+    with contextlib.redirect_stdout(open(os.devnull, "w")):
+        generator = CentralBankGoogleFormGenerator(token_path=token_path)
+    results = {}
+    # The first build renders and uploads every section header; the second reuses them
+    for label in ("cold", "warm"):
+        api.reset_stats()
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(open(os.devnull, "w")):
+            form_id = generator.create_centralbank_survey()
+        elapsed = time.perf_counter() - started
+        results[f"form_build_{label}_seconds"] = round(elapsed, 4)
+        results[f"form_build_{label}_api_calls"] = sum(api.calls.values())
+        print(f"🧾 {label} form build: {elapsed:.2f}s, {sum(api.calls.values())} API call(s) "
+              f"({', '.join(f'{k}={v}' for k, v in sorted(api.calls.items()))})")
+    return form_id, generator.creds, results
+
+
+def bench_distribution(api, creds, form_id, size, mode, workdir):
+    from caricom_central_bank_survey import DistributionJournal, EmailTemplateManager, RecipientsManager, SurveyDistributor
+    from caricom_central_bank_survey.GmailSendEngine import GmailSendEngine, TokenBucket
+
+    csv_path = os.path.join(workdir, f"recipients_{size}.csv")
+    write_recipients(csv_path, size)
+    journal = DistributionJournal(os.path.join(workdir, f"journal_{size}_{mode}.sqlite3"))
+    # The fake enforces its own quota (--quota); don't throttle on the client side as well
+    engine = GmailSendEngine(creds, limiter=TokenBucket(rate=1e9, capacity=1e9))
+    distributor = SurveyDistributor(form_id, creds, EmailTemplateManager(), send_engine=engine,
+                                    journal=journal, recipients=RecipientsManager(csv_path))
+
+    api.reset_stats()
+    tracemalloc.start()
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(open(os.devnull, "w")):
+        results = distributor.distribute_survey(batch=(mode == "batch"))
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    journal.close()
+
+    sent = sum(1 for r in results if r["status"] == "sent")
+    print(f"📨 {size:>7} recipient(s), {mode}: {sent} sent in {elapsed:.2f}s "
+          f"({sent / elapsed:,.0f}/s), {sum(api.calls.values())} API call(s), peak {peak / 2**20:.1f} MiB")
+    return {
+        f"distribution_{mode}_{size}_seconds": round(elapsed, 4),
+        f"distribution_{mode}_{size}_emails_per_second": round(sent / elapsed, 2),
+        f"distribution_{mode}_{size}_failed": len(results) - sent,
+        f"distribution_{mode}_{size}_peak_memory_bytes": peak,
+    }
+
+
+def compare(results, baseline, tolerance):
+    """
+    Returns a description of every metric worse than the baseline by more than `tolerance`.
+    """
+    regressions = []
+    for name, value in results.items():
+        before = baseline.get(name)
+        if not isinstance(before, (int, float)) or before == 0:
+            continue
+        change = (value - before) / before
+        if name.endswith(HIGHER_IS_BETTER):
+            change = -change
+        if change > tolerance:
+            regressions.append(f"{name}: {before} -> {value} ({change:+.0%} worse)")
+    return regressions
+
+
+def parse_quota(values):
+    quota = {}
+    for value in values or []:
+        api_name, _, rate = value.partition("=")
+        quota[api_name] = float(rate)
+    return quota
+
+
+def run(args):
+    with tempfile.TemporaryDirectory(prefix="survey-bench-") as workdir:
+        # Caches and journals of a real run must not leak into (or out of) the benchmark.
+        # Set before the package is imported: the client registry reads its cache dir then.
+        os.environ["HEADER_CACHE_PATH"] = os.path.join(workdir, "header_image_cache.json")
+        os.environ["RESPONSES_DIR"] = os.path.join(workdir, "responses")
+        os.environ["SURVEY_PLAN_CACHE_DIR"] = os.path.join(workdir, "survey_plan_cache")
+        os.environ["DISCOVERY_CACHE_DIR"] = os.path.join(workdir, "discovery_cache")
+        os.environ["DISTRIBUTION_JOURNAL_PATH"] = os.path.join(workdir, "distribution_journal.sqlite3")
+        os.environ["REMINDER_DB_PATH"] = os.path.join(workdir, "reminders.sqlite3")
+        os.environ["API_METRICS_PATH"] = os.path.join(workdir, "api_metrics.json")
+
+        from caricom_central_bank_survey import CredentialManager
+        from caricom_central_bank_survey.ApiClientRegistry import registry
+
+        token_path = os.path.join(workdir, "token.json")
+        write_fake_token(token_path, CredentialManager.SCOPES)
+
+        with FakeGoogleApi(latency=args.latency, quota_per_second=parse_quota(args.quota),
+                           failure_rate=args.failure_rate, seed=args.seed) as api:
+            registry.endpoint = api.url
+            print(f"🧪 Fake Google APIs at {api.url} (latency {args.latency}s, failure rate {args.failure_rate})")
+
+            form_id, creds, results = bench_form_build(api, token_path)
+            for size in args.sizes:
+                results.update(bench_distribution(api, creds, form_id, size, args.mode, workdir))
+
+        CredentialManager.shared(token_path).close()
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark form building and distribution against an offline Google API fake.")
+    parser.add_argument("--sizes", default="10,100,1000,10000,100000",
+                        type=lambda s: [int(n) for n in s.split(",") if n],
+                        help="Comma-separated synthetic recipient list sizes")
+    parser.add_argument("--mode", choices=("batch", "single"), default="batch",
+                        help="Gmail HTTP batches or concurrent single sends")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every fake API request")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Fraction of API calls failing with 503")
+    parser.add_argument("--quota", action="append", metavar="API=CALLS_PER_SECOND",
+                        help="Per-API quota enforced by the fake, e.g. gmail=250 (repeatable)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for failure injection")
+    parser.add_argument("--json", metavar="PATH", help="Write the results as JSON")
+    parser.add_argument("--baseline", metavar="PATH", help="Results JSON from an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed fractional slowdown against the baseline before failing")
+    args = parser.parse_args(argv)
+
+    results = run(args)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f"💾 Results written to {args.json}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            print(f"❌ {len(regressions)} metric(s) regressed by more than {args.tolerance:.0%}:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"✅ No regressions beyond {args.tolerance:.0%} against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,319 @@
+import copy
+import itertools
+import json
+import logging
+import random
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import unquote_plus
+
+logger = logging.getLogger(__name__)
+
+
+class ApiError(Exception):
+    def __init__(self, status: int, message: str, reason: str = "backendError"):
+        super().__init__(message)
+        self.status = status
+        self.reason = reason
+
+    def body(self) -> Dict[str, Any]:
+        return {"error": {"code": self.status, "message": str(self), "errors": [{"reason": self.reason}]}}
+
+
+class FakeGoogleApi:
+    """
+    Offline stand-in for the Forms, Drive, Gmail, Sheets and Docs endpoints this tool
+    calls, served over local HTTP so the real client code paths (discovery, batching,
+    media upload, retries) run unchanged. Point the ApiClientRegistry at `url` to use it.
+
+    Forms keep their items, so batchUpdate indexes, forms().get and incremental syncs
+    behave like the real thing; responses can be seeded per form. Everything else just
+    returns plausible IDs.
+
+    Behaviour knobs, all changeable while running:
+        latency: seconds added to every HTTP request (a Gmail batch counts once).
+        quota_per_second: per-API calls allowed per second; beyond it calls get
+                          429 rateLimitExceeded, like Google's per-user quotas.
+        failure_rate: fraction of calls failing with `failure_status`.
+
+    `calls` counts every API call by "<api>.<method>", batched calls included.
+    """
+    ROUTES = [
+        ("POST", r"/forms/v1/forms", "forms.create"),
+        ("GET", r"/forms/v1/forms/(?P<id>[^/:]+)", "forms.get"),
+        ("POST", r"/forms/v1/forms/(?P<id>[^/:]+):batchUpdate", "forms.batchUpdate"),
+        ("GET", r"/forms/v1/forms/(?P<id>[^/:]+)/responses", "forms.responses.list"),
+        ("POST", r"/drive/upload/drive/v3/files", "drive.files.create"),
+        ("POST", r"/drive/drive/v3/files", "drive.files.create"),
+        ("GET", r"/drive/drive/v3/files/(?P<id>[^/]+)", "drive.files.get"),
+        ("POST", r"/drive/drive/v3/files/(?P<id>[^/]+)/permissions", "drive.permissions.create"),
+        ("POST", r"/gmail/gmail/v1/users/(?P<id>[^/]+)/messages/send", "gmail.messages.send"),
+        ("POST", r"/gmail/batch(?:/.*)?", "gmail.batch"),
+        ("POST", r"/sheets/v4/spreadsheets", "sheets.create"),
+        ("POST", r"/docs/v1/documents", "docs.create"),
+        ("POST", r"/docs/v1/documents/(?P<id>[^/:]+):batchUpdate", "docs.batchUpdate"),
+    ]
+
+    def __init__(self, latency: float = 0.0, quota_per_second: Dict[str, float] = None,
+                 failure_rate: float = 0.0, failure_status: int = 503, seed: int = None,
+                 host: str = "127.0.0.1", port: int = 0):
+        self.latency = latency
+        self.quota_per_second = dict(quota_per_second or {})
+        self.failure_rate = failure_rate
+        self.failure_status = failure_status
+        self.calls = Counter()
+        self.bytes_received = 0
+        self.forms: Dict[str, Dict[str, Any]] = {}
+        self.responses: Dict[str, List[Dict[str, Any]]] = {}
+        self.files: Dict[str, Dict[str, Any]] = {}
+        self.sent = 0
+        self._routes = [(m, re.compile(f"{p}$"), name) for m, p, name in self.ROUTES]
+        self._ids = itertools.count(1)
+        self._random = random.Random(seed)
+        self._windows: Dict[str, Tuple[int, int]] = {}
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeGoogleApi":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-google-api", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "FakeGoogleApi":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.calls.clear()
+            self.bytes_received = 0
+            self.sent = 0
+
+    def seed_responses(self, form_id: str, responses: List[Dict[str, Any]]) -> None:
+        with self._lock:
+            self.responses.setdefault(form_id, []).extend(responses)
+
+    # --- dispatch ---
+
+    def handle(self, method: str, path: str, query: str, body: bytes, headers) -> Tuple[int, Dict[str, str], bytes]:
+        """
+        Serve one HTTP request; returns (status, headers, body).
+        """
+        with self._lock:
+            self.bytes_received += len(body)
+        for route_method, pattern, name in self._routes:
+            match = pattern.match(path)
+            if match and route_method == method:
+                break
+        else:
+            logger.warning(f"FakeGoogleApi: no route for {method} {path}")
+            return self._json(404, ApiError(404, f"No fake for {method} {path}", "notFound").body())
+
+        if name == "gmail.batch":
+            return self._batch(body, headers.get("Content-Type", ""))
+        try:
+            self._admit(name)
+            return self._json(200, getattr(self, "_" + name.replace(".", "_"))(match.groupdict().get("id"), body, query))
+        except ApiError as e:
+            return self._json(e.status, e.body())
+
+    def _admit(self, name: str) -> None:
+        """Count the call, then apply quota and failure injection."""
+        api = name.split(".")[0]
+        with self._lock:
+            self.calls[name] += 1
+            limit = self.quota_per_second.get(api)
+            if limit is not None:
+                second = int(time.monotonic())
+                window, used = self._windows.get(api, (second, 0))
+                if window != second:
+                    window, used = second, 0
+                if used >= limit:
+                    raise ApiError(429, "Rate Limit Exceeded", "rateLimitExceeded")
+                self._windows[api] = (window, used + 1)
+            if self.failure_rate and self._random.random() < self.failure_rate:
+                raise ApiError(self.failure_status, "Injected failure")
+
+    @staticmethod
+    def _json(status: int, payload: Dict[str, Any]) -> Tuple[int, Dict[str, str], bytes]:
+        return status, {"Content-Type": "application/json; charset=UTF-8"}, json.dumps(payload).encode("utf-8")
+
+    def _new_id(self, prefix: str) -> str:
+        return f"{prefix}{next(self._ids):08x}"
+
+    # --- Forms ---
+
+    def _forms_create(self, _, body, query):
+        form = json.loads(body or b"{}")
+        form_id = self._new_id("form")
+        with self._lock:
+            self.forms[form_id] = {"formId": form_id, "info": form.get("info", {}), "items": []}
+        return self.forms[form_id]
+
+    def _form(self, form_id: str) -> Dict[str, Any]:
+        form = self.forms.get(form_id)
+        if form is None:
+            raise ApiError(404, f"Form {form_id} not found", "notFound")
+        return form
+
+    def _forms_get(self, form_id, body, query):
+        with self._lock:
+            return copy.deepcopy(self._form(form_id))
+
+    def _forms_batchUpdate(self, form_id, body, query):
+        requests = json.loads(body).get("requests", [])
+        with self._lock:
+            # Applied to a copy, so a rejected batch leaves the form untouched, as in the real API
+            items = copy.deepcopy(self._form(form_id)["items"])
+            replies = [self._apply_form_request(items, req) for req in requests]
+            self.forms[form_id]["items"] = items
+        return {"replies": replies, "form": {"formId": form_id}}
+
+    def _apply_form_request(self, items: List[Dict[str, Any]], req: Dict[str, Any]) -> Dict[str, Any]:
+        def index(location, upper):
+            idx = location.get("index", 0)
+            if not 0 <= idx <= upper:
+                raise ApiError(400, f"Invalid location index {idx} (form has {len(items)} items)", "badRequest")
+            return idx
+
+        if "createItem" in req:
+            item = copy.deepcopy(req["createItem"]["item"])
+            item.setdefault("itemId", self._new_id("i"))
+            question = item.get("questionItem", {}).get("question")
+            if question is not None:
+                question.setdefault("questionId", self._new_id("q"))
+            items.insert(index(req["createItem"]["location"], len(items)), item)
+            reply = {"itemId": item["itemId"]}
+            if question is not None:
+                reply["questionId"] = [question["questionId"]]
+            return {"createItem": reply}
+        if "deleteItem" in req:
+            items.pop(index(req["deleteItem"]["location"], len(items) - 1))
+        elif "moveItem" in req:
+            item = items.pop(index(req["moveItem"]["originalLocation"], len(items) - 1))
+            items.insert(index(req["moveItem"]["newLocation"], len(items)), item)
+        elif "updateItem" in req:
+            idx = index(req["updateItem"]["location"], len(items) - 1)
+            for field in req["updateItem"].get("updateMask", "").split(","):
+                if field in req["updateItem"]["item"]:
+                    items[idx][field] = copy.deepcopy(req["updateItem"]["item"][field])
+        return {}
+
+    def _forms_responses_list(self, form_id, body, query):
+        params = {k: unquote_plus(v) for k, v in (p.split("=", 1) for p in query.split("&") if "=" in p)}
+        since = re.search(r"timestamp\s*>\s*(\S+)", params.get("filter", ""))
+        with self._lock:
+            responses = [r for r in self.responses.get(form_id, [])
+                         if not since or r.get("lastSubmittedTime", "") > since.group(1)]
+        start = int(params.get("pageToken", 0))
+        size = int(params.get("pageSize", 5000))
+        page = {"responses": responses[start:start + size]}
+        if start + size < len(responses):
+            page["nextPageToken"] = str(start + size)
+        return page
+
+    # --- Drive, Sheets, Docs ---
+
+    def _drive_files_create(self, _, body, query):
+        file_id = self._new_id("file")
+        with self._lock:
+            self.files[file_id] = {"id": file_id, "trashed": False, "size": len(body)}
+        return {"id": file_id}
+
+    def _drive_files_get(self, file_id, body, query):
+        with self._lock:
+            meta = self.files.get(file_id)
+        if meta is None:
+            raise ApiError(404, f"File not found: {file_id}", "notFound")
+        return {"id": file_id, "trashed": meta["trashed"]}
+
+    def _drive_permissions_create(self, file_id, body, query):
+        return {"id": "anyoneWithLink", "type": "anyone", "role": "reader"}
+
+    def _sheets_create(self, _, body, query):
+        return {"spreadsheetId": self._new_id("sheet"), **json.loads(body or b"{}")}
+
+    def _docs_create(self, _, body, query):
+        return {"documentId": self._new_id("doc"), **json.loads(body or b"{}")}
+
+    def _docs_batchUpdate(self, doc_id, body, query):
+        return {"documentId": doc_id, "replies": [{} for _ in json.loads(body).get("requests", [])]}
+
+    # --- Gmail ---
+
+    def _gmail_messages_send(self, _, body, query):
+        with self._lock:
+            self.sent += 1
+        return {"id": self._new_id("msg"), "labelIds": ["SENT"]}
+
+    def _batch(self, body: bytes, content_type: str) -> Tuple[int, Dict[str, str], bytes]:
+        """
+        Serve a multipart/mixed batch: every part is routed like a standalone call
+        (quota and failures apply per part), then answered in one multipart response.
+        """
+        boundary = re.search(r'boundary="?([^";]+)"?', content_type).group(1).encode()
+        out_boundary = "batch_" + self._new_id("b")
+        parts = []
+        for raw in body.split(b"--" + boundary)[1:]:
+            if raw.startswith(b"--"):
+                break
+            # googleapiclient separates lines with bare \n; accept both
+            outer_headers, request = re.split(rb"\r?\n\r?\n", raw.lstrip(b"\r\n"), maxsplit=1)
+            content_id = re.search(rb"Content-ID:\s*<([^>]+)>", outer_headers, re.IGNORECASE).group(1).decode()
+            head, payload = (re.split(rb"\r?\n\r?\n", request, maxsplit=1) + [b""])[:2]
+            payload = payload.rstrip(b"\r\n")
+            method, target = head.splitlines()[0].decode().split(" ")[:2]
+            path, _, query = target.partition("?")
+            status, _, response = self.handle(method, path, query, payload, {})
+            parts.append(
+                f"--{out_boundary}\r\nContent-Type: application/http\r\n"
+                f"Content-ID: <response-{content_id}>\r\n\r\n"
+                f"HTTP/1.1 {status} {'OK' if status == 200 else 'Error'}\r\n"
+                f"Content-Type: application/json; charset=UTF-8\r\n\r\n"
+                f"{response.decode('utf-8')}\r\n"
+            )
+        payload = "".join(parts) + f"--{out_boundary}--\r\n"
+        return 200, {"Content-Type": f"multipart/mixed; boundary={out_boundary}"}, payload.encode("utf-8")
+
+    def _handler_class(self):
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _serve(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0) or 0))
+                if api.latency:
+                    time.sleep(api.latency)
+                path, _, query = self.path.partition("?")
+                status, headers, payload = api.handle(self.command, path, query, body, self.headers)
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _serve
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
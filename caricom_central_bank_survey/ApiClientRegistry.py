@@ -0,0 +1,154 @@
+import contextlib
+import contextvars
+import json
+import logging
+import os
+import threading
+import urllib.request
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class ApiClientRegistry:
+    """
+    Process-wide cache of Google API clients, built on first use.
+
+    Each discovery document is parsed once per process: it comes from the copy bundled
+    with google-api-python-client or, failing that, from a local cache directory that
+    is filled the first time the document is fetched, so later runs start offline.
+    Clients are then created from the parsed document.
+
+    httplib2 transports are not thread-safe, so clients are cached per thread; on each
+    thread every service for the same credentials shares one authorized transport
+    (and with it one connection pool).
+
+    Requests made through these clients, batches included, are timed and counted by
+    ApiMetrics. `limits` maps API names to shared rate limiters (anything with an
+    `acquire(tokens)` method, e.g. a TokenBucket); every request to a listed API, from
+    any client or thread, first takes a token, so concurrent work stays within one budget.
+    `limited()` applies limiters to one context only, taking precedence over `limits`
+    there; work submitted to pools through ApiMetrics.submit stays under them.
+
+    Setting `endpoint` (or GOOGLE_API_ENDPOINT) moves every API's root URL to
+    `<endpoint>/<api>/` instead of Google, e.g. to the offline fake used by
+    benchmarks/benchmark.py.
+    """
+    DISCOVERY_URIS = (
+        "https://{api}.googleapis.com/$discovery/rest?version={version}",
+        "https://www.googleapis.com/discovery/v1/apis/{api}/{version}/rest",
+    )
+
+    def __init__(self, cache_dir: str = None, endpoint: str = None):
+        self.cache_dir = cache_dir or os.getenv("DISCOVERY_CACHE_DIR") or "discovery_cache"
+        self.endpoint = endpoint or os.getenv("GOOGLE_API_ENDPOINT")
+        self._documents: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.limits: Dict[str, Any] = {}
+        self._scoped_limits = contextvars.ContextVar(f"api_client_limits_{id(self)}", default={})
+        self.builds = 0
+
+    @contextlib.contextmanager
+    def limited(self, limits: Dict[str, Any]):
+        """
+        Rate-limit requests made inside the block, in this context, with `limits`
+        (API name -> limiter) on top of the process-wide `limits`.
+        """
+        token = self._scoped_limits.set({**self._scoped_limits.get(), **limits})
+        try:
+            yield
+        finally:
+            self._scoped_limits.reset(token)
+
+    def limiter(self, api: str) -> Optional[Any]:
+        """
+        The rate limiter requests to `api` take a token from in this context, if any.
+        """
+        scoped = self._scoped_limits.get()
+        return scoped[api] if api in scoped else self.limits.get(api)
+
+    def get(self, name: str, version: str, creds):
+        """
+        Return this thread's client for `name`/`version` authorized with `creds`.
+        """
+        services = self._thread_cache("services")
+        key = (name, version, id(creds), self.endpoint)
+        entry = services.get(key)
+        if entry is None or entry[0] is not creds:
+            from googleapiclient.discovery import build_from_document
+            from .InstrumentedRequests import InstrumentedBatchHttpRequest, InstrumentedHttpRequest
+            document = self.discovery_document(name, version)
+            if self.endpoint:
+                # Moving rootUrl (not just the base URL) also redirects media uploads and batches
+                root = f"{self.endpoint.rstrip('/')}/{name}/"
+                document = dict(document, rootUrl=root, mtlsRootUrl=root)
+            service = build_from_document(document, http=self._http(creds), requestBuilder=InstrumentedHttpRequest)
+            batch_uri = f"{document['rootUrl']}{document.get('batchPath', 'batch')}"
+            service.new_batch_http_request = (
+                lambda callback=None: InstrumentedBatchHttpRequest(callback=callback, batch_uri=batch_uri))
+            entry = services[key] = (creds, service)
+            self.builds += 1
+            logger.debug(f"Built {name} {version} client on {threading.current_thread().name}")
+        return entry[1]
+
+    def discovery_document(self, name: str, version: str) -> Dict[str, Any]:
+        with self._lock:
+            document = self._documents.get((name, version))
+            if document is None:
+                document = self._documents[(name, version)] = json.loads(self._load_document(name, version))
+            return document
+
+    def _load_document(self, name: str, version: str) -> str:
+        from googleapiclient.discovery_cache import get_static_doc
+        content = get_static_doc(name, version)
+        if content:
+            return content
+
+        path = os.path.join(self.cache_dir, f"{name}.{version}.json")
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                return f.read()
+
+        for uri in self.DISCOVERY_URIS:
+            try:
+                with urllib.request.urlopen(uri.format(api=name, version=version), timeout=30) as resp:
+                    content = resp.read().decode("utf-8")
+                break
+            except OSError as e:
+                logger.warning(f"Discovery document for {name} {version} not available at {uri}: {e}")
+        else:
+            raise RuntimeError(f"No discovery document found for {name} {version}")
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+        return content
+
+    def _http(self, creds):
+        transports = self._thread_cache("transports")
+        entry = transports.get(id(creds))
+        if entry is None or entry[0] is not creds:
+            import google_auth_httplib2
+            import httplib2
+            entry = transports[id(creds)] = (creds, google_auth_httplib2.AuthorizedHttp(creds, http=httplib2.Http()))
+        return entry[1]
+
+    def _thread_cache(self, name: str) -> dict:
+        cache = getattr(self._local, name, None)
+        if cache is None:
+            cache = {}
+            setattr(self._local, name, cache)
+        return cache
+
+
+registry = ApiClientRegistry()
+
+
+def get_service(name: str, version: str, creds):
+    """
+    Shortcut for `registry.get`: the calling thread's shared client for this API.
+    """
+    return registry.get(name, version, creds)
@@ -0,0 +1,212 @@
+import contextlib
+import contextvars
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict
+
+logger = logging.getLogger(__name__)
+
+
+class ApiMetrics:
+    """
+    Process-wide accounting of Google API calls, grouped by pipeline stage.
+
+    Every client built by the ApiClientRegistry executes its requests through the
+    classes in InstrumentedRequests, which report each call
+    here with its method ID (e.g. "gmail.users.messages.send"), latency, request and
+    response size and HTTP status. Calls inside a Gmail batch are recorded one by one
+    (sharing the batch's latency) and the batch round trip itself as "<api>.batch".
+    Code that retries a failed call reports it with record_retry().
+
+    Calls are attributed to the innermost `stage()` open in the calling context. Each
+    thread has its own context, so work handed to a pool must be submitted through
+    `submit` to stay in the caller's stage. A stage's wall time includes the stages
+    nested in it and is summed over runs of the same stage, including concurrent ones.
+    """
+    # Quota cost per call where an API charges more than one unit; everything else
+    # counts one (Forms, Drive, Docs and Sheets quotas are per request).
+    QUOTA_UNITS = {
+        "gmail.users.messages.send": 100,
+        "gmail.users.messages.get": 5,
+        "gmail.users.messages.list": 5,
+    }
+    DEFAULT_STAGE = "other"
+    LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # Open stages, innermost last
+        self._stages = contextvars.ContextVar(f"api_metrics_stages_{id(self)}", default=())
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.started = time.time()
+            self.stage_seconds: Dict[str, float] = {}
+            self.methods: Dict[tuple, Dict[str, Any]] = {}
+
+    @property
+    def current_stage(self) -> str:
+        stages = self._stages.get()
+        return stages[-1] if stages else self.DEFAULT_STAGE
+
+    @contextlib.contextmanager
+    def stage(self, name: str):
+        """
+        Attribute API calls made inside the block, in this context, to stage `name`.
+        """
+        token = self._stages.set(self._stages.get() + (name,))
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            self._stages.reset(token)
+            with self._lock:
+                self.stage_seconds[name] = self.stage_seconds.get(name, 0.0) + elapsed
+
+    @staticmethod
+    def submit(pool, fn, *args, **kwargs):
+        """
+        `pool.submit(fn, ...)`, with `fn` run in a copy of the caller's context, so its
+        API calls count towards the caller's current stage.
+        """
+        return pool.submit(contextvars.copy_context().run, fn, *args, **kwargs)
+
+    def record(self, method_id: str, seconds: float, request_bytes: int = 0, response_bytes: int = 0,
+               status: int = 200, quota_units: int = None) -> None:
+        """
+        Account for one API call; `status` 0 means the transport failed before a response.
+        """
+        method_id = method_id or "unknown"
+        if quota_units is None:
+            quota_units = self.QUOTA_UNITS.get(method_id, 1)
+        with self._lock:
+            stats = self._stats(self.current_stage, method_id)
+            stats["calls"] += 1
+            stats["seconds"] += seconds
+            stats["max_seconds"] = max(stats["max_seconds"], seconds)
+            stats["request_bytes"] += request_bytes
+            stats["response_bytes"] += response_bytes
+            stats["quota_units"] += quota_units
+            for i, bound in enumerate(self.LATENCY_BUCKETS):
+                if seconds <= bound:
+                    stats["buckets"][i] += 1
+            if not 200 <= status < 300:
+                stats["errors"][str(status)] = stats["errors"].get(str(status), 0) + 1
+
+    def record_retry(self, method_id: str, count: int = 1) -> None:
+        with self._lock:
+            self._stats(self.current_stage, method_id)["retries"] += count
+
+    def _stats(self, stage: str, method_id: str) -> Dict[str, Any]:
+        stats = self.methods.get((stage, method_id))
+        if stats is None:
+            stats = self.methods[(stage, method_id)] = {
+                "calls": 0, "seconds": 0.0, "max_seconds": 0.0, "request_bytes": 0, "response_bytes": 0,
+                "quota_units": 0, "retries": 0, "errors": {}, "buckets": [0] * len(self.LATENCY_BUCKETS),
+            }
+        return stats
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Totals per stage, each with a per-method breakdown.
+        """
+        with self._lock:
+            stages = {}
+            for (stage, method_id), stats in sorted(self.methods.items()):
+                entry = stages.setdefault(stage, {
+                    "seconds": round(self.stage_seconds.get(stage, 0.0), 3),
+                    "calls": 0, "api_seconds": 0.0, "quota_units": 0, "retries": 0, "errors": 0, "methods": {},
+                })
+                entry["calls"] += stats["calls"]
+                entry["api_seconds"] = round(entry["api_seconds"] + stats["seconds"], 3)
+                entry["quota_units"] += stats["quota_units"]
+                entry["retries"] += stats["retries"]
+                entry["errors"] += sum(stats["errors"].values())
+                entry["methods"][method_id] = {
+                    "calls": stats["calls"],
+                    "seconds": round(stats["seconds"], 3),
+                    "mean_seconds": round(stats["seconds"] / stats["calls"], 4) if stats["calls"] else 0.0,
+                    "max_seconds": round(stats["max_seconds"], 4),
+                    "request_bytes": stats["request_bytes"],
+                    "response_bytes": stats["response_bytes"],
+                    "quota_units": stats["quota_units"],
+                    "retries": stats["retries"],
+                    "errors": dict(stats["errors"]),
+                }
+            return {
+                "started": self.started,
+                "duration_seconds": round(time.time() - self.started, 3),
+                "calls": sum(s["calls"] for s in stages.values()),
+                "quota_units": sum(s["quota_units"] for s in stages.values()),
+                "stages": stages,
+            }
+
+    def to_prometheus(self) -> str:
+        """
+        The same data in Prometheus text exposition format.
+        """
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            lines.append(f"# HELP google_api_{name} {help_text}")
+            lines.append(f"# TYPE google_api_{name} {kind}")
+            for labels, value in samples:
+                label_text = ",".join(f'{k}="{v}"' for k, v in labels.items())
+                lines.append(f"google_api_{name}{{{label_text}}} {value}")
+
+        with self._lock:
+            items = sorted(self.methods.items())
+            labelled = [({"stage": stage, "service": method_id.split(".")[0], "method": method_id}, stats)
+                        for (stage, method_id), stats in items]
+            metric("calls_total", "counter", "API calls made.",
+                   [(labels, stats["calls"]) for labels, stats in labelled])
+            metric("errors_total", "counter", "API calls that did not return 2xx, by status (0: transport error).",
+                   [(dict(labels, status=status), count) for labels, stats in labelled
+                    for status, count in sorted(stats["errors"].items())])
+            metric("retries_total", "counter", "API calls retried after a failure.",
+                   [(labels, stats["retries"]) for labels, stats in labelled])
+            metric("quota_units_total", "counter", "Quota units consumed.",
+                   [(labels, stats["quota_units"]) for labels, stats in labelled])
+            metric("request_bytes_total", "counter", "Request body bytes sent.",
+                   [(labels, stats["request_bytes"]) for labels, stats in labelled])
+            metric("response_bytes_total", "counter", "Response body bytes received.",
+                   [(labels, stats["response_bytes"]) for labels, stats in labelled])
+            lines.append("# HELP google_api_latency_seconds API call latency.")
+            lines.append("# TYPE google_api_latency_seconds histogram")
+            for labels, stats in labelled:
+                label_text = ",".join(f'{k}="{v}"' for k, v in labels.items())
+                for bound, count in zip(self.LATENCY_BUCKETS, stats["buckets"]):
+                    lines.append(f'google_api_latency_seconds_bucket{{{label_text},le="{bound}"}} {count}')
+                lines.append(f'google_api_latency_seconds_bucket{{{label_text},le="+Inf"}} {stats["calls"]}')
+                lines.append(f"google_api_latency_seconds_sum{{{label_text}}} {stats['seconds']:.6f}")
+                lines.append(f"google_api_latency_seconds_count{{{label_text}}} {stats['calls']}")
+            metric("stage_seconds", "gauge", "Wall time spent in each pipeline stage.",
+                   [({"stage": stage}, f"{seconds:.6f}") for stage, seconds in sorted(self.stage_seconds.items())])
+        return "\n".join(lines) + "\n"
+
+    def export(self, path: str = None) -> str:
+        """
+        Write the metrics to `path` (API_METRICS_PATH, default api_metrics.json):
+        Prometheus text for .prom/.txt files, JSON otherwise.
+
+        Returns:
+            str: The path written.
+        """
+        path = path or os.getenv("API_METRICS_PATH") or "api_metrics.json"
+        if path.endswith((".prom", ".txt")):
+            content = self.to_prometheus()
+        else:
+            content = json.dumps(self.summary(), indent=2)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+        return path
+
+
+metrics = ApiMetrics()
@@ -0,0 +1,222 @@
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Union
+
+from .ApiClientRegistry import registry
+from .ApiMetrics import metrics
+from .CentralBankGoogleFormGenerator import CentralBankGoogleFormGenerator
+from .CredentialManager import CredentialManager
+from .DistributionJournal import DistributionJournal
+from .EmailTemplateManager import EmailTemplateManager
+from .GmailSendEngine import GmailSendEngine, TokenBucket
+from .HeaderImageCache import HeaderImageCache
+from .RecipientsManager import RecipientsManager
+from .ReminderSystem import ReminderSystem
+from .SurveyDistributor import SurveyDistributor
+
+logger = logging.getLogger(__name__)
+
+
+class CampaignOrchestrator:
+    """
+    Builds and distributes several survey variants side by side, e.g. for central
+    banks, CSDs and regulators, each with its own definition file, form and recipients.
+
+    A campaign is a dict {"name", "survey" (definition file), "recipients" (CSV path,
+    or a list of them)} with an optional "form_id" to sync that form instead of
+    creating a new one; a (survey, recipients) pair is accepted too.
+
+    Forms are built, and invitations sent, for up to `max_workers` campaigns at once.
+    They share one request budget per API (API_REQUESTS_PER_SECOND, applied with
+    ApiClientRegistry.limited to this orchestrator's work only), one Gmail quota
+    bucket, one header image cache and one distribution journal. The cache is written
+    safely by all builds, but two builds rendering the same header at the same moment
+    may each upload it. Each campaign's progress is kept in `status`, guarded by a lock
+    (read it through `statuses()`).
+    """
+    MAX_WORKERS = 4
+    # Conservative shares of Google's per-user, per-minute request quotas
+    API_REQUESTS_PER_SECOND = {"forms": 2, "docs": 1, "sheets": 1, "drive": 10}
+    PROGRESS_EVERY = 100
+
+    def __init__(self, campaigns: List[Union[Dict[str, Any], tuple]], token_path: str = None,
+                 max_workers: int = None, limits: Dict[str, float] = None, journal: DistributionJournal = None):
+        self.campaigns = [self._campaign(c, i) for i, c in enumerate(campaigns)]
+        names = [c["name"] for c in self.campaigns]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Campaign names must be unique: {names}")
+        self.token_path = token_path
+        self.max_workers = max_workers or self.MAX_WORKERS
+        self.limits = dict(self.API_REQUESTS_PER_SECOND if limits is None else limits)
+        self.limiters = {api: TokenBucket(rate=rate, capacity=max(1.0, rate)) for api, rate in self.limits.items()}
+        self.creds = CredentialManager.shared(token_path).get()
+        self.header_cache = HeaderImageCache()
+        self.journal = journal or DistributionJournal()
+        self.gmail_limiter = TokenBucket(
+            rate=GmailSendEngine.QUOTA_UNITS_PER_SECOND,
+            capacity=GmailSendEngine.QUOTA_UNITS_PER_SECOND
+        )
+        self.status = {
+            c["name"]: {"name": c["name"], "survey": c["survey"], "form_id": c.get("form_id"), "form_url": None,
+                        "stage": "pending", "recipients": 0, "sent": 0, "failed": 0, "seconds": 0.0, "error": None}
+            for c in self.campaigns
+        }
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_manifest(cls, path: str, **kwargs) -> "CampaignOrchestrator":
+        """
+        Load campaigns from a JSON manifest: {"campaigns": [...]} or just the list.
+        Relative survey and recipient paths are resolved against the manifest's directory.
+        """
+        with open(path, encoding="utf-8") as f:
+            manifest = json.load(f)
+        campaigns = manifest.get("campaigns", []) if isinstance(manifest, dict) else manifest
+        base = os.path.dirname(os.path.abspath(path))
+
+        def resolve(p):
+            return p if os.path.isabs(p) else os.path.join(base, p)
+
+        for campaign in campaigns:
+            if isinstance(campaign, dict):
+                if campaign.get("survey"):
+                    campaign["survey"] = resolve(campaign["survey"])
+                recipients = campaign.get("recipients")
+                if isinstance(recipients, str):
+                    campaign["recipients"] = os.pathsep.join(resolve(p) for p in recipients.split(os.pathsep))
+                elif isinstance(recipients, list):
+                    campaign["recipients"] = [resolve(p) for p in recipients]
+        return cls(campaigns, **kwargs)
+
+    @staticmethod
+    def _campaign(campaign, index: int) -> Dict[str, Any]:
+        if isinstance(campaign, (tuple, list)):
+            survey, recipients = campaign
+            campaign = {"survey": survey, "recipients": recipients}
+        campaign = dict(campaign)
+        if not campaign.get("recipients"):
+            raise ValueError(f"Campaign {campaign.get('name') or index} has no recipients")
+        if not campaign.get("name"):
+            survey = campaign.get("survey")
+            campaign["name"] = os.path.splitext(os.path.basename(survey))[0] if survey else f"campaign-{index}"
+        return campaign
+
+    def run(self, batch: bool = False, remind: bool = True) -> List[Dict[str, Any]]:
+        """
+        Build every campaign's form, then send its invitations.
+
+        Returns:
+            list: The final status of each campaign.
+        """
+        self.build()
+        return self.distribute(batch=batch, remind=remind)
+
+    def build(self) -> List[Dict[str, Any]]:
+        """
+        Create (or sync) every campaign's form concurrently.
+
+        Returns:
+            list: The status of each campaign; failed builds have stage "failed" and an error.
+        """
+        self._for_each(self.campaigns, self._build)
+        return self.statuses()
+
+    def distribute(self, batch: bool = False, remind: bool = True) -> List[Dict[str, Any]]:
+        """
+        Send invitations for every campaign whose form was built, concurrently, and
+        schedule reminders for them unless `remind` is False.
+        """
+        built = {s["name"] for s in self.statuses() if s["stage"] == "built"}
+        built = [c for c in self.campaigns if c["name"] in built]
+        self._for_each(built, lambda campaign: self._distribute(campaign, batch, remind))
+        return self.statuses()
+
+    def statuses(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [dict(self.status[c["name"]]) for c in self.campaigns]
+
+    def _for_each(self, campaigns: List[Dict[str, Any]], work) -> None:
+        if not campaigns:
+            return
+        # Tasks run in copies of this context, so the budgets apply to them and nothing else
+        with registry.limited(self.limiters):
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(campaigns))) as pool:
+                for future in [metrics.submit(pool, work, campaign) for campaign in campaigns]:
+                    future.result()
+
+    def _update(self, name: str, **changes) -> None:
+        with self._lock:
+            self.status[name].update(changes)
+
+    def _build(self, campaign: Dict[str, Any]) -> None:
+        name = campaign["name"]
+        started = time.perf_counter()
+        self._update(name, stage="building")
+        print(f"🧾 [{name}] Building form from {campaign['survey']}...")
+        try:
+            generator = CentralBankGoogleFormGenerator(token_path=self.token_path, survey_path=campaign.get("survey"))
+            # One cache for all campaigns: concurrent writers of the same file would lose entries
+            generator.header_cache = self.header_cache
+            if campaign.get("form_id"):
+                form_id = generator.sync_centralbank_survey(campaign["form_id"])
+            else:
+                form_id = generator.create_centralbank_survey()
+            if not form_id:
+                raise RuntimeError("Form creation failed.")
+            self._update(name, stage="built", form_id=form_id,
+                         form_url=f"https://docs.google.com/forms/d/{form_id}/viewform",
+                         seconds=round(time.perf_counter() - started, 2))
+            print(f"✅ [{name}] Form ready: https://docs.google.com/forms/d/{form_id}/viewform")
+        except Exception as e:
+            logger.error(f"Building campaign {name} failed", exc_info=True)
+            self._update(name, stage="failed", error=str(e), seconds=round(time.perf_counter() - started, 2))
+            print(f"❌ [{name}] Form build failed: {e}")
+
+    def _distribute(self, campaign: Dict[str, Any], batch: bool, remind: bool) -> None:
+        name = campaign["name"]
+        started = time.perf_counter()
+        with self._lock:
+            status = self.status[name]
+            status["stage"] = "sending"
+            form_id, build_seconds = status["form_id"], status["seconds"]
+        print(f"📨 [{name}] Sending invitations for form {form_id}...")
+
+        def progress(result):
+            with self._lock:
+                status["sent" if result["status"] == "sent" else "failed"] += 1
+                sent, failed = status["sent"], status["failed"]
+            if (sent + failed) % self.PROGRESS_EVERY == 0:
+                print(f"📨 [{name}] {sent + failed} processed: {sent} sent, {failed} failed")
+
+        try:
+            recipients = RecipientsManager(campaign["recipients"])
+            engine = GmailSendEngine(self.creds, limiter=self.gmail_limiter)
+            distributor = SurveyDistributor(form_id, self.creds, EmailTemplateManager(),
+                                            send_engine=engine, journal=self.journal, recipients=recipients)
+            distributor.distribute_survey(batch=batch, on_result=progress)
+            if remind:
+                added = ReminderSystem(form_id=form_id, creds=self.creds).setup_schedule(recipients)
+                print(f"⏰ [{name}] {added} reminder(s) scheduled")
+            with self._lock:
+                status.update(stage="done", recipients=recipients.stats.get("emails", 0),
+                              seconds=round(build_seconds + time.perf_counter() - started, 2))
+                sent, failed = status["sent"], status["failed"]
+            print(f"✅ [{name}] {sent} sent, {failed} failed")
+        except Exception as e:
+            logger.error(f"Distributing campaign {name} failed", exc_info=True)
+            self._update(name, stage="failed", error=str(e))
+            print(f"❌ [{name}] Distribution failed: {e}")
+
+    def report(self) -> None:
+        """
+        Print one line of progress per campaign.
+        """
+        print(f"\n  {'campaign':<20} {'stage':<9} {'form':<46} {'sent':>7} {'failed':>7} {'secs':>8}")
+        for s in self.statuses():
+            print(f"  {s['name']:<20} {s['stage']:<9} {s['form_id'] or '-':<46} {s['sent']:>7} {s['failed']:>7} {s['seconds']:>8.1f}")
+            if s["error"]:
+                print(f"    ❌ {s['error']}")
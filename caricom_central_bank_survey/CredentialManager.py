@@ -0,0 +1,178 @@
+import contextlib
+import datetime
+import json
+import logging
+import os
+import pickle
+import threading
+from typing import Dict, List
+
+import config
+
+logger = logging.getLogger(__name__)
+
+
+@contextlib.contextmanager
+def _file_lock(path: str):
+    """
+    Exclusive advisory lock on `path` (created if missing), held across processes.
+    """
+    with open(path, "a+b") as f:
+        if os.name == "nt":
+            import msvcrt
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+class CredentialManager:
+    """
+    One OAuth token per token file, shared by every part of the tool and every process.
+
+    The token is stored as authorized-user JSON and only read or written under an
+    exclusive file lock, so concurrent distribution, reminder and polling processes
+    never clobber each other's refreshes: whoever takes the lock first refreshes, the
+    others pick up the new token from disk. Legacy pickled tokens are converted on
+    first load.
+
+    Within a process all callers get the same Credentials object. A daemon thread
+    refreshes it REFRESH_AHEAD_SECONDS before expiry, in place, so API calls in long
+    send loops never stop to refresh.
+    """
+    # One consent covers forms, Drive, Docs, responses, Sheets and Gmail
+    SCOPES = [
+        "https://www.googleapis.com/auth/forms.body",
+        "https://www.googleapis.com/auth/drive",
+        "https://www.googleapis.com/auth/documents",
+        "https://www.googleapis.com/auth/forms.responses.readonly",
+        "https://www.googleapis.com/auth/spreadsheets",
+        "https://www.googleapis.com/auth/gmail.send",
+    ]
+    REFRESH_AHEAD_SECONDS = 300
+    RETRY_SECONDS = 30
+
+    _instances: Dict[str, "CredentialManager"] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, token_path: str = None, client_secrets_path: str = None, scopes: List[str] = None):
+        self.token_path = token_path or config.TOKEN_PATH or "token.json"
+        self.client_secrets_path = client_secrets_path or config.GMAIL_CREDENTIALS_PATH or config.CREDENTIALS_FILE
+        self.scopes = list(scopes or self.SCOPES)
+        self.lock_path = f"{self.token_path}.lock"
+        self.creds = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._refresher = None
+
+    @classmethod
+    def shared(cls, token_path: str = None, client_secrets_path: str = None, scopes: List[str] = None) -> "CredentialManager":
+        """
+        The process-wide manager for a token file (TOKEN_PATH by default).
+        """
+        token_path = os.path.abspath(token_path or config.TOKEN_PATH or "token.json")
+        with cls._instances_lock:
+            manager = cls._instances.get(token_path)
+            if manager is None:
+                manager = cls._instances[token_path] = cls(token_path, client_secrets_path, scopes)
+            return manager
+
+    def get(self):
+        """
+        Return valid credentials, authorizing interactively only if no usable token exists.
+        """
+        with self._lock:
+            if self.creds is None or not self.creds.valid:
+                self._obtain()
+            self._start_refresher()
+            return self.creds
+
+    def close(self) -> None:
+        self._stop.set()
+
+    def _obtain(self) -> None:
+        from google.auth.transport.requests import Request
+        with _file_lock(self.lock_path):
+            creds = self._load()
+            if creds is not None and not set(self.scopes) <= set(creds.scopes or []):
+                logger.info("Stored token lacks required scopes; re-authorizing")
+                creds = None
+            if creds is not None and not creds.valid:
+                if creds.refresh_token:
+                    creds.refresh(Request())
+                else:
+                    creds = None
+            if creds is None:
+                from google_auth_oauthlib.flow import InstalledAppFlow
+                flow = InstalledAppFlow.from_client_secrets_file(self.client_secrets_path, self.scopes)
+                creds = flow.run_local_server(port=0)
+            self._save(creds)
+        self.creds = creds
+
+    def _start_refresher(self) -> None:
+        if self._refresher is None and self.creds.refresh_token:
+            self._refresher = threading.Thread(target=self._refresh_loop, name="token-refresher", daemon=True)
+            self._refresher.start()
+
+    def _refresh_loop(self) -> None:
+        while not self._stop.is_set():
+            expiry = self.creds.expiry
+            if expiry is None:
+                return
+            # google-auth keeps expiry as naive UTC
+            wait = (expiry - datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)).total_seconds() - self.REFRESH_AHEAD_SECONDS
+            if wait > 0 and self._stop.wait(wait):
+                return
+            try:
+                self._refresh_ahead()
+            except Exception as e:
+                logger.warning(f"Background token refresh failed; retrying in {self.RETRY_SECONDS}s: {e}")
+                self._stop.wait(self.RETRY_SECONDS)
+
+    def _refresh_ahead(self) -> None:
+        from google.auth.transport.requests import Request
+        with _file_lock(self.lock_path):
+            # Another process may have refreshed already; adopt its token instead of refreshing again
+            stored = self._load()
+            if stored is not None and stored.expiry and stored.expiry > self.creds.expiry:
+                self.creds.token, self.creds.expiry = stored.token, stored.expiry
+                logger.info(f"Adopted token refreshed by another process (expires {stored.expiry:%H:%M:%S} UTC)")
+                return
+            # Refreshes the shared object in place, so every client using it sees the new token
+            self.creds.refresh(Request())
+            self._save(self.creds)
+        logger.info(f"Refreshed access token ahead of expiry (now expires {self.creds.expiry:%H:%M:%S} UTC)")
+
+    def _load(self):
+        from google.oauth2.credentials import Credentials
+        if not os.path.exists(self.token_path) or os.path.getsize(self.token_path) == 0:
+            return None
+        with open(self.token_path, "rb") as f:
+            data = f.read()
+        if data[:1] == b"\x80":
+            # Pickled token from older versions; rewritten as JSON on save
+            return pickle.loads(data)
+        return Credentials.from_authorized_user_info(json.loads(data))
+
+    def _save(self, creds) -> None:
+        tmp_path = f"{self.token_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(creds.to_json())
+        os.replace(tmp_path, self.token_path)
+
+
+def get_credentials(token_path: str = None, client_secrets_path: str = None):
+    """
+    Shortcut for the shared manager's credentials.
+    """
+    return CredentialManager.shared(token_path, client_secrets_path).get()
@@ -0,0 +1,76 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Set
+
+logger = logging.getLogger(__name__)
+
+
+class DistributionJournal:
+    """
+    Append-only record of email sends, keyed by (form_id, template, recipient).
+
+    Every send result is appended as soon as it is known, so a crashed or interrupted
+    distribution can be rerun and will skip everyone already emailed. The journal is a
+    SQLite database in WAL mode with synchronous=NORMAL: each record is committed
+    immediately (safe against the process dying), while fsyncs are batched into WAL
+    checkpoints rather than paid per email.
+    """
+
+    def __init__(self, path: str = None):
+        self.path = path or os.getenv("DISTRIBUTION_JOURNAL_PATH") or "distribution_journal.sqlite3"
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS sends (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                form_id TEXT NOT NULL,
+                template TEXT NOT NULL,
+                recipient TEXT NOT NULL,
+                status TEXT NOT NULL,
+                message_id TEXT,
+                attempts INTEGER,
+                error TEXT,
+                recorded_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS sends_by_key ON sends (form_id, template, recipient, status);
+        """)
+        self.conn.commit()
+
+    def completed(self, form_id: str, template: str) -> Set[str]:
+        """
+        Recipients (lower-cased) that were already sent `template` for `form_id`.
+        """
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT DISTINCT recipient FROM sends WHERE form_id = ? AND template = ? AND status = 'sent'",
+                (form_id, template)
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def record(self, form_id: str, template: str, result: Dict[str, Any]) -> None:
+        """
+        Append one send result record (as produced by GmailSendEngine).
+        """
+        with self._lock:
+            self.conn.execute(
+                "INSERT INTO sends (form_id, template, recipient, status, message_id, attempts, error, recorded_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (form_id, template, result["to"].strip().lower(), result["status"],
+                 result.get("message_id"), result.get("attempts"), result.get("error"), time.time())
+            )
+            self.conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
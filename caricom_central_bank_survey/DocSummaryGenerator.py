@@ -0,0 +1,161 @@
+import logging
+import math
+from typing import Any, Dict, List, Tuple
+
+from .ApiClientRegistry import get_service
+from .ApiMetrics import metrics
+from .FormSynchronizer import question_schema
+
+logger = logging.getLogger(__name__)
+
+### Survey summary document
+# The whole document is laid out locally and sent as one insertText plus its styling
+# in a single documents().batchUpdate, instead of one round trip per paragraph.
+
+KIND_LABELS = {
+    "text": "Short answer",
+    "paragraph": "Long answer",
+    "choice": "Single choice",
+    "checkbox": "Multiple choice",
+}
+
+
+def _utf16_len(text: str) -> int:
+    # Docs indexes count UTF-16 code units, so characters outside the BMP count twice
+    return len(text.encode("utf-16-le")) // 2
+
+
+class _DocLayout:
+    """
+    Accumulates paragraphs and the [start, end) ranges that need styling, tracking
+    Docs indexes as it goes (the body starts at index 1).
+    """
+
+    def __init__(self):
+        self.parts: List[str] = []
+        self.index = 1
+        self.styles: List[Tuple[str, int, int]] = []
+        self.links: List[Tuple[str, int, int]] = []
+        self.lists: List[Tuple[int, int]] = []
+
+    def paragraph(self, text: str, style: str = "NORMAL_TEXT") -> Tuple[int, int]:
+        start = self.index
+        self.parts.append(f"{text}\n")
+        self.index += _utf16_len(text) + 1
+        if style != "NORMAL_TEXT":
+            self.styles.append((style, start, self.index))
+        return start, self.index
+
+    def link(self, label: str, url: str) -> None:
+        start, _ = self.paragraph(f"{label}{url}")
+        url_start = start + _utf16_len(label)
+        self.links.append((url, url_start, url_start + _utf16_len(url)))
+
+    def numbered(self, items: List[str]) -> None:
+        if not items:
+            return
+        start = self.index
+        for text in items:
+            self.paragraph(text)
+        self.lists.append((start, self.index))
+
+    def requests(self) -> List[Dict[str, Any]]:
+        if not self.parts:
+            return []
+        requests = [{"insertText": {"location": {"index": 1}, "text": "".join(self.parts)}}]
+        for style, start, end in self.styles:
+            requests.append({"updateParagraphStyle": {
+                "range": {"startIndex": start, "endIndex": end},
+                "paragraphStyle": {"namedStyleType": style},
+                "fields": "namedStyleType"
+            }})
+        for url, start, end in self.links:
+            requests.append({"updateTextStyle": {
+                "range": {"startIndex": start, "endIndex": end},
+                "textStyle": {"link": {"url": url}},
+                "fields": "link"
+            }})
+        for start, end in self.lists:
+            requests.append({"createParagraphBullets": {
+                "range": {"startIndex": start, "endIndex": end},
+                "bulletPreset": "NUMBERED_DECIMAL_ALPHA_ROMAN"
+            }})
+        return requests
+
+
+def build_summary_requests(title: str, form_url: str, section_definitions: List[Dict[str, Any]],
+                           aggregates: Dict[str, Any] = None) -> List[Dict[str, Any]]:
+    """
+    Lay out the summary document and return the batchUpdate requests that produce it.
+
+    Args:
+        title (str): Document heading.
+        form_url (str): Link to the live form.
+        section_definitions (list): The generator's section definitions.
+        aggregates (dict): Optional `SurveyAnalytics.dashboard()` output; adds response
+                           counts, medians and section readiness scores.
+
+    Returns:
+        list: Docs API requests, to be applied to an empty document in one call.
+    """
+    questions = question_schema(section_definitions)
+    by_section = {}
+    for q in questions:
+        by_section.setdefault(q["section"], []).append(q)
+
+    doc = _DocLayout()
+    doc.paragraph(title, "TITLE")
+    doc.link("Survey form: ", form_url)
+    if aggregates:
+        doc.paragraph(f"{aggregates['respondents']} response(s) from "
+                      f"{len(aggregates['jurisdictions'])} jurisdiction(s)")
+
+    medians = aggregates["medians"] if aggregates else {}
+    answered = aggregates["distributions"].sum(axis=1) if aggregates else {}
+    scores = aggregates["section_scores"].mean() if aggregates else {}
+
+    for sec in section_definitions:
+        doc.paragraph(sec["title"], "HEADING_2")
+        if sec.get("description"):
+            doc.paragraph(sec["description"])
+        if sec["title"] in scores:
+            doc.paragraph(f"Mean readiness score: {scores[sec['title']]:.1f} / 100")
+
+        items = []
+        for q in by_section.get(sec["title"], []):
+            if q["kind"] == "scale":
+                line = f"{q['title']} (Scale {q['low']}–{q['high']})"
+                median = medians.get(q["question_id"])
+                if median is not None and not math.isnan(median):
+                    line += f" — median {median:g}, n={int(answered[q['question_id']])}"
+            else:
+                line = f"{q['title']} ({KIND_LABELS[q['kind']]})"
+                if q.get("options"):
+                    line += f": {', '.join(q['options'])}"
+            items.append(line)
+        doc.numbered(items)
+
+    return doc.requests()
+
+
+@metrics.stage("summary_doc")
+def create_doc_summary(creds, form_url: str, title: str, section_definitions: List[Dict[str, Any]] = None,
+                       aggregates: Dict[str, Any] = None, docs_service=None) -> str:
+    """
+    Create a Google Doc summarizing the survey, in two API calls (create + batchUpdate).
+
+    Returns:
+        str: URL of the new document.
+    """
+    if docs_service is None:
+        docs_service = get_service("docs", "v1", creds)
+    if section_definitions is None:
+        section_definitions = []
+
+    doc = docs_service.documents().create(body={"title": f"{title} Summary"}).execute()
+    doc_id = doc["documentId"]
+    requests = build_summary_requests(title, form_url, section_definitions, aggregates)
+    if requests:
+        docs_service.documents().batchUpdate(documentId=doc_id, body={"requests": requests}).execute()
+    logger.info(f"Summary document {doc_id}: {len(requests)} request(s) in one batchUpdate")
+    return f"https://docs.google.com/document/d/{doc_id}/edit"
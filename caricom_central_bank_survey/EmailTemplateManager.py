@@ -1,7 +1,18 @@
+import base64
+import string
+from collections import OrderedDict
+from email.mime.text import MIMEText
+
+
 class EmailTemplateManager:
     """
     Manages templated email messages for survey invitations and reminders.
+
+    Templates are compiled once into literal chunks and substitution slots. Rendered
+    bodies, and their MIME/base64 encoding, are cached by substitution values, so
+    addresses that receive identical content share one render and one encode.
     """
+    RENDER_CACHE_SIZE = 256
 
     def __init__(self):
         self.templates = {
@@ -81,8 +92,59 @@ class EmailTemplateManager:
     <p>Sincerely,<br><strong>On behalf of: CARICOM Secretariat</strong></p>
   </div>
 </body>
+</html>""",
+            "survey_reminder": """<!DOCTYPE html>
+<html>
+<head>
+  <meta charset="UTF-8">
+  <style>
+    body {{ font-family: Arial, sans-serif; color: #333; line-height: 1.6; }}
+    .container {{ max-width: 680px; margin: auto; padding: 20px; background-color: #fdfdfd; }}
+    h1 {{ color: #005a8b; }}
+    .cta {{ display: block; margin-top: 20px; padding: 10px 20px; background-color: #005a8b;
+          color: white; text-decoration: none; border-radius: 5px; text-align: center;
+          font-weight: bold; }}
+  </style>
+</head>
+<body>
+  <div class="container">
+    <h1>⏰ Reminder: {survey_title}</h1>
+    <p>Dear {name},</p>
+    <p>This is a friendly reminder that the <strong>{survey_title}</strong> is still open.
+    If you have not yet had the opportunity to respond, we would be grateful for your institution's input.</p>
+    <p>Your insights will directly inform regional technical recommendations and policy alignment.</p>
+    <a class="cta" href="{form_url}" target="_blank">👉 Access the Survey</a>
+    <p>Sincerely,<br><strong>On behalf of: CARICOM Secretariat</strong></p>
+  </div>
+</body>
 </html>"""
         }
+        self._formatter = string.Formatter()
+        self._compiled = {name: self._compile(text) for name, text in self.templates.items()}
+        self._render_cache = OrderedDict()
+        self._encoded_cache = OrderedDict()
+
+    def _compile(self, template: str) -> list:
+        """
+        Split a str.format template into (literal, field_name, format_spec, conversion) chunks.
+        """
+        return list(self._formatter.parse(template))
+
+    def _cached(self, cache: OrderedDict, key, build):
+        try:
+            value = cache[key]
+            cache.move_to_end(key)
+            return value
+        except KeyError:
+            pass
+        except TypeError:
+            # Unhashable substitution values are rendered without caching
+            return build()
+        value = cache[key] = build()
+        if len(cache) > self.RENDER_CACHE_SIZE:
+            cache.popitem(last=False)
+        return value
+
 
     def render(self, template_name: str, **kwargs) -> str:
         """
@@ -97,4 +159,60 @@ class EmailTemplateManager:
         """
         if template_name not in self.templates:
             raise ValueError(f"Template '{template_name}' not found.")
-        return self.templates[template_name].format(**kwargs)
\ No newline at end of file
+        chunks = self._compiled.get(template_name)
+        if chunks is None:
+            # Template added after construction
+            chunks = self._compiled[template_name] = self._compile(self.templates[template_name])
+        key = (template_name, tuple(sorted(kwargs.items())))
+        return self._cached(self._render_cache, key, lambda: self._render_compiled(chunks, kwargs))
+
+    def _render_compiled(self, chunks: list, values: dict) -> str:
+        fmt = self._formatter
+        parts = []
+        for literal, field_name, format_spec, conversion in chunks:
+            parts.append(literal)
+            if field_name is not None:
+                value, _ = fmt.get_field(field_name, (), values)
+                parts.append(fmt.format_field(fmt.convert_field(value, conversion), format_spec or ""))
+        return "".join(parts)
+
+    def render_raw(self, template_name: str, to: str, subject: str, **kwargs) -> str:
+        """
+        Render a template straight into the base64url `raw` payload for Gmail messages.send.
+
+        The MIME headers and the base64-encoded HTML body are encoded once per distinct
+        (template, subject, substitutions); only the `to` header is encoded per address.
+        Each segment before the body is padded to a multiple of 3 bytes, so the
+        base64 encodings of the segments can simply be concatenated.
+
+        Args:
+            template_name (str): The key in self.templates.
+            to (str): Recipient address.
+            subject (str): Email subject.
+            **kwargs: Template substitutions, as for `render`.
+
+        Returns:
+            str: base64url-encoded RFC 2822 message.
+        """
+        key = (template_name, subject, tuple(sorted(kwargs.items())))
+        head, body = self._cached(
+            self._encoded_cache, key,
+            lambda: self._encode_static_parts(self.render(template_name, **kwargs), subject)
+        )
+        to_line = f"to: {to}".encode("utf-8")
+        # Trailing whitespace after an address is ignorable CFWS
+        to_segment = to_line + b" " * ((-(len(to_line) + 2)) % 3) + b"\n\n"
+        return head + base64.urlsafe_b64encode(to_segment).decode() + body
+
+    @staticmethod
+    def _encode_static_parts(body: str, subject: str) -> tuple:
+        message = MIMEText(body, "html")
+        message["subject"] = subject
+        message["from"] = "me"
+        headers, _, payload = message.as_bytes().partition(b"\n\n")
+        # Pad the last header ("from: me") so the header block is a multiple of 3 bytes
+        headers += b" " * ((-(len(headers) + 1)) % 3) + b"\n"
+        return (
+            base64.urlsafe_b64encode(headers).decode(),
+            base64.urlsafe_b64encode(payload).decode()
+        )
@@ -0,0 +1,133 @@
+import json
+import logging
+import random
+import time
+from typing import Any, Dict, List
+
+from googleapiclient.errors import HttpError
+
+from .ApiMetrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class FormRequestBatcher:
+    """
+    Packs Google Forms API requests into as few forms().batchUpdate calls as the
+    request size limit allows.
+
+    Item indexes are expected to be computed locally by the caller. The live form
+    is only re-read when a batch is rejected for an item index or location, in which
+    case createItem indexes in that batch are clamped to the real item count and the
+    batch is retried once. Rate-limited (429, rate-limit 403) and 5xx responses are
+    retried with exponential backoff; any other error is raised at once.
+    """
+    # Stay well below the API's request body limit to leave room for JSON framing.
+    MAX_BATCH_BYTES = 900 * 1024
+    MAX_BATCH_REQUESTS = 500
+    MAX_RETRIES = 5
+    MAX_BACKOFF_SECONDS = 32
+    RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+    RATE_LIMIT_REASONS = ("rateLimitExceeded", "userRateLimitExceeded")
+
+    def __init__(self, forms_service, max_bytes: int = None, max_requests: int = None):
+        self.forms = forms_service
+        self.max_bytes = max_bytes or self.MAX_BATCH_BYTES
+        self.max_requests = max_requests or self.MAX_BATCH_REQUESTS
+        self.calls = 0
+
+    def pack(self, requests: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """
+        Split requests into ordered chunks that each fit in a single batchUpdate.
+
+        Args:
+            requests (list): Forms API request objects, in the order they must apply.
+
+        Returns:
+            list: Chunks of requests; concatenated they equal the input.
+        """
+        chunks, chunk, size = [], [], 0
+        for req in requests:
+            req_size = len(json.dumps(req, separators=(",", ":")).encode("utf-8")) + 1
+            if chunk and (size + req_size > self.max_bytes or len(chunk) >= self.max_requests):
+                chunks.append(chunk)
+                chunk, size = [], 0
+            chunk.append(req)
+            size += req_size
+        if chunk:
+            chunks.append(chunk)
+        return chunks
+
+    def send(self, form_id: str, requests: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Apply requests to a form using the minimum number of batchUpdate calls.
+
+        Args:
+            form_id (str): Target form ID.
+            requests (list): Forms API request objects.
+
+        Returns:
+            list: The per-request replies returned by the API, in request order.
+        """
+        replies = []
+        for chunk in self.pack(requests):
+            replies.extend(self._send_chunk(form_id, chunk))
+        return replies
+
+    def _send_chunk(self, form_id: str, chunk: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        attempts, clamped = 0, False
+        while True:
+            try:
+                return self._execute(form_id, chunk)
+            except HttpError as e:
+                if not clamped and self._is_location_error(e):
+                    logger.warning(f"Batch of {len(chunk)} requests rejected for form {form_id}: {e}; re-reading form")
+                    clamped = True
+                    self._clamp_to_live_form(form_id, chunk)
+                elif attempts < self.MAX_RETRIES and self._is_retryable(e):
+                    attempts += 1
+                    delay = min(self.MAX_BACKOFF_SECONDS, 2 ** (attempts - 1)) + random.uniform(0, 1)
+                    logger.warning(f"Retrying batch of {len(chunk)} requests for form {form_id} in {delay:.1f}s: {e}")
+                    time.sleep(delay)
+                else:
+                    raise
+                metrics.record_retry("forms.forms.batchUpdate")
+
+    @staticmethod
+    def _error_text(error: HttpError) -> str:
+        content = error.content
+        return content.decode("utf-8", "ignore") if isinstance(content, bytes) else str(content or "")
+
+    @classmethod
+    def _is_location_error(cls, error: HttpError) -> bool:
+        # A stale index fails validation with a 400 naming the index or location
+        text = cls._error_text(error).lower()
+        return error.resp.status == 400 and ("index" in text or "location" in text)
+
+    @classmethod
+    def _is_retryable(cls, error: HttpError) -> bool:
+        status = error.resp.status
+        if status in cls.RETRYABLE_STATUSES:
+            return True
+        return status == 403 and any(reason in cls._error_text(error) for reason in cls.RATE_LIMIT_REASONS)
+
+    def _execute(self, form_id: str, chunk: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        self.calls += 1
+        response = self.forms.forms().batchUpdate(
+            formId=form_id,
+            body={"requests": chunk}
+        ).execute()
+        return response.get("replies", [])
+
+    def _clamp_to_live_form(self, form_id: str, chunk: List[Dict[str, Any]]) -> None:
+        info = self.forms.forms().get(formId=form_id).execute()
+        item_count = len(info.get("items", []))
+        for req in chunk:
+            if "createItem" in req:
+                loc = req["createItem"]["location"]
+                idx = loc.get("index", 0)
+                if isinstance(idx, int):
+                    loc["index"] = min(max(0, idx), item_count)
+                item_count += 1
+            elif "deleteItem" in req:
+                item_count = max(0, item_count - 1)
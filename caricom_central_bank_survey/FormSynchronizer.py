@@ -0,0 +1,162 @@
+import bisect
+import hashlib
+import logging
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class FormSynchronizer:
+    """
+    Computes the minimal set of Forms API requests that turn a live form into the
+    locally defined one.
+
+    Items are matched by itemId, which the generator derives from a stable key per
+    section/question (see `stable_item_id`), so wording fixes become a single
+    updateItem instead of a rebuild and the form keeps its published link.
+    """
+    # Item payload fields compared between the local definition and the live form.
+    ITEM_FIELDS = ("title", "description", "questionItem", "imageItem", "pageBreakItem", "textItem")
+
+    def __init__(self, resolve_item: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None):
+        # Called on every item that is actually created or updated, e.g. to upload a header image.
+        self.resolve_item = resolve_item or (lambda item: item)
+
+    @staticmethod
+    def stable_item_id(key: str) -> str:
+        return hashlib.sha1(f"item:{key}".encode("utf-8")).hexdigest()[:8]
+
+    @staticmethod
+    def stable_question_id(key: str) -> str:
+        return hashlib.sha1(f"question:{key}".encode("utf-8")).hexdigest()[:8]
+
+    def diff(self, live_items: List[Dict[str, Any]], desired_items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Build deleteItem/createItem/moveItem/updateItem requests, in application order.
+
+        Args:
+            live_items (list): `items` of the form as returned by forms().get.
+            desired_items (list): Items in their intended order, each with an `itemId`.
+
+        Returns:
+            list: Forms API requests; empty if the live form already matches.
+        """
+        live_by_id = {item.get("itemId"): item for item in live_items}
+        desired_ids = {item["itemId"] for item in desired_items}
+        order = [item.get("itemId") for item in live_items]
+        requests = []
+
+        # 1) Drop items that no longer exist locally, highest index first so indexes stay valid
+        for idx in range(len(order) - 1, -1, -1):
+            if order[idx] not in desired_ids:
+                requests.append({"deleteItem": {"location": {"index": idx}}})
+                del order[idx]
+
+        # 2) Keep the longest run of items already in the right relative order; move or create the rest
+        positions = {item_id: idx for idx, item_id in enumerate(order)}
+        kept = self._longest_ordered_run([
+            item["itemId"] for item in desired_items if item["itemId"] in positions
+        ], positions)
+
+        for target, item in enumerate(desired_items):
+            item_id = item["itemId"]
+            if item_id in kept:
+                continue
+            prev_id = desired_items[target - 1]["itemId"] if target else None
+            if item_id in positions:
+                current = order.index(item_id)
+                order.pop(current)
+                new_index = order.index(prev_id) + 1 if prev_id else 0
+                order.insert(new_index, item_id)
+                requests.append({"moveItem": {
+                    "originalLocation": {"index": current},
+                    "newLocation": {"index": new_index}
+                }})
+            else:
+                new_index = order.index(prev_id) + 1 if prev_id else 0
+                order.insert(new_index, item_id)
+                requests.append({"createItem": {
+                    "location": {"index": new_index},
+                    "item": self.resolve_item(item)
+                }})
+
+        # 3) Patch content of surviving items, now sitting at their final index
+        for target, item in enumerate(desired_items):
+            live = live_by_id.get(item["itemId"])
+            if live is None:
+                continue
+            mask = [f for f in self.ITEM_FIELDS if f in item and not self._matches(item[f], live.get(f))]
+            if mask:
+                requests.append({"updateItem": {
+                    "item": self.resolve_item(item),
+                    "location": {"index": target},
+                    "updateMask": ",".join(mask)
+                }})
+
+        logger.info(f"Form diff: {len(requests)} request(s) for {len(desired_items)} desired / {len(live_items)} live items")
+        return requests
+
+    @staticmethod
+    def _longest_ordered_run(item_ids: List[str], positions: Dict[str, int]) -> set:
+        """Items forming the longest subsequence whose live positions are increasing."""
+        tails, tail_ids, parent = [], [], {}
+        for item_id in item_ids:
+            pos = positions[item_id]
+            i = bisect.bisect_left(tails, pos)
+            parent[item_id] = tail_ids[i - 1] if i else None
+            if i == len(tails):
+                tails.append(pos)
+                tail_ids.append(item_id)
+            else:
+                tails[i] = pos
+                tail_ids[i] = item_id
+        kept, node = set(), tail_ids[-1] if tail_ids else None
+        while node is not None:
+            kept.add(node)
+            node = parent[node]
+        return kept
+
+    @classmethod
+    def _matches(cls, desired: Any, live: Any) -> bool:
+        """True if every field set locally has the same value on the live item."""
+        if isinstance(desired, dict):
+            live = live if isinstance(live, dict) else {}
+            return all(cls._matches(v, live.get(k)) for k, v in desired.items())
+        if live is None:
+            # The API omits fields left at their default (False, 0, "")
+            return not desired
+        return desired == live
+
+
+def question_schema(section_definitions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Describe every question of the survey, keyed the same way the generator assigns
+    stable question IDs (see `SurveyPlan.section_items`).
+
+    Returns:
+        list: One dict per question with `question_id`, `title`, `section`, `kind`
+              ("scale", "choice", "checkbox", "text" or "paragraph") and, for scale
+              questions, `low`/`high`, for choice questions, `options`.
+    """
+    questions = []
+    for sec in section_definitions:
+        for q in sec.get("questions", []):
+            question = q.get("questionItem", {}).get("question")
+            if question is None:
+                continue
+            entry = {
+                "question_id": FormSynchronizer.stable_question_id(q["key"]),
+                "title": q.get("title", ""),
+                "section": sec["title"],
+            }
+            if "scaleQuestion" in question:
+                scale = question["scaleQuestion"]
+                entry.update(kind="scale", low=scale.get("low", 1), high=scale["high"])
+            elif "choiceQuestion" in question:
+                choice = question["choiceQuestion"]
+                entry["kind"] = "checkbox" if choice.get("type") == "CHECKBOX" else "choice"
+                entry["options"] = [opt["value"] for opt in choice.get("options", []) if "value" in opt]
+            else:
+                entry["kind"] = "paragraph" if question.get("textQuestion", {}).get("paragraph") else "text"
+            questions.append(entry)
+    return questions
@@ -0,0 +1,260 @@
+import base64
+import itertools
+import logging
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from email.mime.text import MIMEText
+from typing import Any, Callable, Dict, Iterable, List
+
+from googleapiclient.errors import HttpError
+
+from .ApiClientRegistry import get_service
+from .ApiMetrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: `rate` tokens per second, holding at most `capacity`.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1) -> None:
+        """Block until `tokens` are available, then take them."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+                wait = (tokens - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class GmailSendEngine:
+    """
+    Sends Gmail messages from a pool of worker threads under a shared rate limit.
+
+    Every send takes quota from a token bucket sized to Gmail's per-user limit, and
+    requests failing with 429, rate-limit 403s or 5xx errors are retried with
+    exponential backoff. Each message produces a result record:
+    {"to", "status" ("sent" | "failed"), "message_id", "attempts", "error"}.
+    """
+    # Gmail allows 250 quota units per user per second; messages.send costs 100.
+    QUOTA_UNITS_PER_SECOND = 250
+    SEND_QUOTA_UNITS = 100
+    MAX_WORKERS = 4
+    MAX_RETRIES = 5
+    MAX_BACKOFF_SECONDS = 32
+    RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+    # Gmail accepts up to 100 calls per HTTP batch but recommends no more than 50.
+    BATCH_SIZE = 50
+    MAX_BATCH_SIZE = 100
+    RATE_LIMIT_REASONS = ("rateLimitExceeded", "userRateLimitExceeded")
+
+    def __init__(self, creds, max_workers: int = None, limiter: TokenBucket = None, max_retries: int = None):
+        self.creds = creds
+        self.max_workers = max_workers or self.MAX_WORKERS
+        self.max_retries = self.MAX_RETRIES if max_retries is None else max_retries
+        self.limiter = limiter or TokenBucket(
+            rate=self.QUOTA_UNITS_PER_SECOND,
+            capacity=self.QUOTA_UNITS_PER_SECOND
+        )
+        self._local = threading.local()
+
+    def _gmail(self):
+        # httplib2 transports are not thread-safe; the registry keeps one client per worker thread
+        return get_service("gmail", "v1", self.creds)
+
+    def _messages(self):
+        # users().messages() rebuilds every method from the discovery document on each
+        # call (milliseconds apiece), so keep one resource per thread and client
+        gmail = self._gmail()
+        if getattr(self._local, "gmail", None) is not gmail:
+            self._local.gmail, self._local.messages = gmail, gmail.users().messages()
+        return self._local.messages
+
+    @staticmethod
+    def build_raw(to: str, subject: str, body: str) -> str:
+        """
+        Encode an HTML email as the base64url `raw` payload expected by messages.send.
+        """
+        message = MIMEText(body, "html")
+        message["to"] = to
+        message["from"] = "me"
+        message["subject"] = subject
+        return base64.urlsafe_b64encode(message.as_bytes()).decode()
+
+    def send_all(self, messages: Iterable[Dict[str, Any]],
+                 on_result: Callable[[Dict[str, Any]], None] = None) -> List[Dict[str, Any]]:
+        """
+        Send messages concurrently.
+
+        Messages are taken from `messages` only as workers free up, so a generator that
+        renders them is never run far ahead of the sends.
+
+        Args:
+            messages (iterable): Dicts with "to" and either "raw" or "subject" and "body".
+            on_result (callable): Called with each final result record as soon as it is known.
+
+        Returns:
+            list: One result record per message, in input order.
+        """
+        results = []
+
+        def send(index, message):
+            result = results[index] = self.send_one(message)
+            if on_result:
+                on_result(result)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            in_flight = set()
+            for message in messages:
+                results.append(None)
+                in_flight.add(metrics.submit(pool, send, len(results) - 1, message))
+                if len(in_flight) >= 2 * self.max_workers:
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        future.result()
+            for future in in_flight:
+                future.result()
+        return results
+
+    def send_batched(self, messages: Iterable[Dict[str, Any]], batch_size: int = None,
+                     on_result: Callable[[Dict[str, Any]], None] = None) -> List[Dict[str, Any]]:
+        """
+        Send messages as multipart HTTP batch requests, one round trip per batch.
+
+        Messages are taken from `messages` one batch at a time. A per-message callback
+        records each outcome; only messages that failed with a retryable error are kept
+        and re-sent, in new batches, with exponential backoff.
+
+        Args:
+            messages (iterable): Dicts with "to" and either "raw" or "subject" and "body".
+            batch_size (int): Calls per batch, capped at MAX_BATCH_SIZE.
+            on_result (callable): Called with each final result record as soon as it is known.
+
+        Returns:
+            list: One result record per message, in input order.
+
+        Raises:
+            Exception: The first error raised by `on_result`, once every message has been
+                       dealt with. Callback errors never cause a message to be re-sent.
+        """
+        batch_size = min(batch_size or self.BATCH_SIZE, self.MAX_BATCH_SIZE)
+        results, callback_errors = [], []
+
+        def notify(result):
+            # Batch callbacks run inside batch.execute(); an error escaping here would
+            # look like a failed round trip and re-send messages Gmail already accepted
+            if on_result:
+                try:
+                    on_result(result)
+                except Exception as e:
+                    logger.error(f"Result callback failed for email to {result['to']}: {e}", exc_info=True)
+                    callback_errors.append(e)
+
+        def send_chunk(chunk, retry):
+            # chunk: (index, raw) pairs; retryable failures are added to `retry` the same way
+            raws = dict(chunk)
+
+            def on_response(request_id, response, exception):
+                idx = int(request_id)
+                result = results[idx]
+                result["attempts"] += 1
+                if exception is None:
+                    result.update(status="sent", message_id=response.get("id"), error=None)
+                    notify(result)
+                    return
+                result["error"] = str(exception)
+                if self.is_retryable(exception):
+                    retry[idx] = raws[idx]
+
+            batch = self._gmail().new_batch_http_request(callback=on_response)
+            messages_resource = self._messages()
+            for idx, raw in chunk:
+                self.limiter.acquire(self.SEND_QUOTA_UNITS)
+                batch.add(messages_resource.send(userId="me", body={"raw": raw}), request_id=str(idx))
+            try:
+                batch.execute()
+            except Exception as e:
+                # The whole batch request failed; none of its callbacks ran
+                for idx, _ in chunk:
+                    results[idx]["attempts"] += 1
+                    results[idx]["error"] = str(e)
+                if self.is_retryable(e):
+                    retry.update(chunk)
+
+        retry, round_no = {}, 1
+        pending = iter(messages)
+        while True:
+            chunk = []
+            for message in itertools.islice(pending, batch_size):
+                results.append({"to": message["to"], "status": "failed", "message_id": None, "attempts": 0, "error": None})
+                raw = message.get("raw") or self.build_raw(message["to"], message["subject"], message["body"])
+                chunk.append((len(results) - 1, raw))
+            if not chunk:
+                break
+            send_chunk(chunk, retry)
+
+        while retry and round_no <= self.max_retries:
+            delay = min(self.MAX_BACKOFF_SECONDS, 2 ** (round_no - 1)) + random.uniform(0, 1)
+            logger.warning(f"Retrying {len(retry)} failed email(s) in {delay:.1f}s")
+            metrics.record_retry("gmail.users.messages.send", len(retry))
+            time.sleep(delay)
+            round_no += 1
+            failed, retry = sorted(retry.items()), {}
+            for start in range(0, len(failed), batch_size):
+                send_chunk(failed[start:start + batch_size], retry)
+
+        for result in results:
+            if result["status"] != "sent":
+                logger.error(f"Giving up on email to {result['to']} after {result['attempts']} attempt(s): {result['error']}")
+                notify(result)
+        if callback_errors:
+            raise callback_errors[0]
+        return results
+
+    def send_one(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        to = message["to"]
+        raw = message.get("raw") or self.build_raw(to, message["subject"], message["body"])
+        result = {"to": to, "status": "failed", "message_id": None, "attempts": 0, "error": None}
+
+        while True:
+            self.limiter.acquire(self.SEND_QUOTA_UNITS)
+            result["attempts"] += 1
+            try:
+                sent = self._messages().send(userId="me", body={"raw": raw}).execute()
+                result.update(status="sent", message_id=sent.get("id"), error=None)
+                return result
+            except Exception as e:
+                result["error"] = str(e)
+                if result["attempts"] > self.max_retries or not self.is_retryable(e):
+                    logger.error(f"Giving up on email to {to} after {result['attempts']} attempt(s): {e}")
+                    return result
+                delay = min(self.MAX_BACKOFF_SECONDS, 2 ** (result["attempts"] - 1)) + random.uniform(0, 1)
+                logger.warning(f"Retrying email to {to} in {delay:.1f}s: {e}")
+                metrics.record_retry("gmail.users.messages.send")
+                time.sleep(delay)
+
+    @classmethod
+    def is_retryable(cls, error: Exception) -> bool:
+        if isinstance(error, HttpError):
+            status = error.resp.status
+            if status in cls.RETRYABLE_STATUSES:
+                return True
+            content = error.content.decode("utf-8", "ignore") if isinstance(error.content, bytes) else str(error.content)
+            return status == 403 and any(reason in content for reason in cls.RATE_LIMIT_REASONS)
+        # Dropped connections and timeouts
+        return isinstance(error, (ConnectionError, TimeoutError, OSError))
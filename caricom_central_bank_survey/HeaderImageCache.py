@@ -0,0 +1,83 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+from typing import Any, Dict, Optional
+
+from googleapiclient.errors import HttpError
+
+logger = logging.getLogger(__name__)
+
+
+class HeaderImageCache:
+    """
+    Persistent, content-addressed map from rendered section header images to the
+    Drive file IDs they were uploaded as.
+
+    The key is a hash of everything that affects the pixels (title, description,
+    fonts, dimensions, colors), so an unchanged section never needs to be rendered
+    or uploaded again.
+    """
+
+    def __init__(self, cache_path: str = None):
+        self.cache_path = cache_path or os.getenv("HEADER_CACHE_PATH") or "header_image_cache.json"
+        self.entries = self._load()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(title: str, desc: str, style: Dict[str, Any]) -> str:
+        """
+        Content hash of a header image; stable across processes and hosts.
+        """
+        payload = json.dumps([title, desc, style], sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def lookup(self, key: str, drive) -> Optional[str]:
+        """
+        Return the cached Drive file ID for `key` if that file still exists.
+
+        Args:
+            key (str): Content hash from `HeaderImageCache.key`.
+            drive: Authorized Drive v3 service used to confirm the file is still there.
+
+        Returns:
+            str | None: The file ID, or None if nothing usable is cached.
+        """
+        file_id = self.entries.get(key)
+        if not file_id:
+            return None
+        try:
+            meta = drive.files().get(fileId=file_id, fields="id,trashed").execute()
+            if not meta.get("trashed"):
+                return file_id
+        except HttpError as e:
+            if e.resp.status not in (403, 404):
+                raise
+        logger.info(f"Cached header image {file_id} is gone; it will be re-rendered")
+        with self._lock:
+            self.entries.pop(key, None)
+            self._save()
+        return None
+
+    def store(self, key: str, file_id: str) -> None:
+        with self._lock:
+            self.entries[key] = file_id
+            self._save()
+
+    def _load(self) -> Dict[str, str]:
+        if not os.path.exists(self.cache_path):
+            return {}
+        try:
+            with open(self.cache_path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable header image cache {self.cache_path}: {e}")
+            return {}
+
+    def _save(self) -> None:
+        # Callers hold self._lock
+        tmp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.cache_path)
@@ -0,0 +1,117 @@
+import io
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from typing import Any, Dict, List, Tuple
+
+from googleapiclient.http import MediaIoBaseUpload
+
+from .ApiClientRegistry import get_service
+from .ApiMetrics import metrics
+from .HeaderImageCache import HeaderImageCache
+from .HeaderImageRenderer import render_header_png
+
+logger = logging.getLogger(__name__)
+
+
+def upload_header_png(drive, png: bytes, cache_key: str) -> str:
+    """
+    Upload a rendered header PNG to Drive and make it publicly readable.
+
+    Returns:
+        str: The Drive file ID.
+    """
+    # Upload straight from memory; the name is derived from the content hash, so
+    # concurrent generators on one host never collide and reruns reuse the same name.
+    media = MediaIoBaseUpload(io.BytesIO(png), mimetype="image/png")
+    meta = {"name": f"hdr_{cache_key[:16]}.png"}
+    uploaded = drive.files().create(body=meta, media_body=media, fields="id").execute()
+    file_id = uploaded["id"]
+
+    # Make the file public
+    drive.permissions().create(
+        fileId=file_id,
+        body={"role": "reader", "type": "anyone"}
+    ).execute()
+    return file_id
+
+
+class HeaderImagePipeline:
+    """
+    Renders and uploads all section header images ahead of form construction.
+
+    Cache lookups and uploads run in a bounded thread pool, each thread with its own
+    Drive client from the ApiClientRegistry (the HTTP transport is not thread-safe). Rendering runs in
+    a process pool, and each finished PNG is handed straight to the upload pool.
+    """
+    UPLOAD_WORKERS = 4
+
+    def __init__(self, creds, cache: HeaderImageCache, style: Dict[str, Any],
+                 render_workers: int = None, upload_workers: int = None):
+        self.creds = creds
+        self.cache = cache
+        self.style = style
+        self.render_workers = render_workers or os.cpu_count() or 1
+        self.upload_workers = upload_workers or self.UPLOAD_WORKERS
+
+    def _drive(self):
+        return get_service("drive", "v3", self.creds)
+
+    def run(self, headers: List[Tuple[str, str]]) -> Dict[Tuple[str, str], str]:
+        """
+        Make sure every (title, description) header has an uploaded image.
+
+        Args:
+            headers (list): (title, description) pairs, already cleaned.
+
+        Returns:
+            dict: (title, description) -> Drive file ID, for every header that succeeded.
+        """
+        keys = {header: HeaderImageCache.key(*header, self.style) for header in dict.fromkeys(headers)}
+        file_ids = {}
+
+        with ThreadPoolExecutor(max_workers=self.upload_workers) as uploads:
+            # 1) Reuse whatever is still on Drive
+            lookups = {metrics.submit(uploads, self._lookup, key): header for header, key in keys.items()}
+            for future in as_completed(lookups):
+                header = lookups[future]
+                try:
+                    file_id = future.result()
+                except Exception as e:
+                    logger.warning(f"Header image cache lookup failed for '{header[0]}': {e}")
+                    file_id = None
+                if file_id:
+                    file_ids[header] = file_id
+            missing = [header for header in keys if header not in file_ids]
+
+            # 2) Render the rest in parallel and upload each PNG as soon as it is ready
+            pending = {}
+            if missing:
+                workers = min(self.render_workers, len(missing))
+                with ProcessPoolExecutor(max_workers=workers) as renders:
+                    rendered = {renders.submit(render_header_png, *header, self.style): header for header in missing}
+                    for future in as_completed(rendered):
+                        header = rendered[future]
+                        try:
+                            png = future.result()
+                        except Exception as e:
+                            logger.error(f"Rendering header image for '{header[0]}' failed: {e}", exc_info=True)
+                            continue
+                        pending[metrics.submit(uploads, self._upload, png, keys[header])] = header
+
+            for future in as_completed(pending):
+                header = pending[future]
+                try:
+                    file_ids[header] = future.result()
+                    self.cache.store(keys[header], file_ids[header])
+                except Exception as e:
+                    logger.error(f"Uploading header image for '{header[0]}' failed: {e}", exc_info=True)
+
+        logger.info(f"Header images: {len(keys) - len(missing)} cached, {len(missing)} rendered")
+        return file_ids
+
+    def _lookup(self, cache_key: str):
+        return self.cache.lookup(cache_key, self._drive())
+
+    def _upload(self, png: bytes, cache_key: str) -> str:
+        return upload_header_png(self._drive(), png, cache_key)
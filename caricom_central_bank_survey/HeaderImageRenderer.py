@@ -0,0 +1,131 @@
+import functools
+import io
+import threading
+from typing import Any, Dict, List
+
+from PIL import Image, ImageDraw, ImageFont
+
+### Section header rendering
+# Kept free of Google API imports so it can run in worker processes.
+
+# One reusable PNG encode buffer per thread (and so per worker process)
+_buffers = threading.local()
+
+
+def _png_buffer() -> io.BytesIO:
+    buf = getattr(_buffers, "png", None)
+    if buf is None:
+        buf = _buffers.png = io.BytesIO()
+    buf.seek(0)
+    buf.truncate()
+    return buf
+
+
+# Liberation Sans is metric-compatible with Arial, so Linux hosts without Arial wrap
+# lines identically; Pillow's bundled scalable font is the last resort.
+FONT_FALLBACKS = {
+    "arial.ttf": ["LiberationSans-Regular.ttf", "DejaVuSans.ttf"],
+    "arialbd.ttf": ["LiberationSans-Bold.ttf", "DejaVuSans-Bold.ttf"],
+}
+
+
+@functools.lru_cache(maxsize=None)
+def get_font(name: str, size: int):
+    for candidate in [name, *FONT_FALLBACKS.get(name, [])]:
+        try:
+            return ImageFont.truetype(candidate, size)
+        except IOError:
+            continue
+    return ImageFont.load_default(size=size)
+
+
+@functools.lru_cache(maxsize=8192)
+def text_width(text: str, font) -> float:
+    return font.getlength(text)
+
+
+@functools.lru_cache(maxsize=2048)
+def text_height(line: str, font) -> int:
+    return font.getbbox(line)[3]
+
+
+def wrap_text(text: str, font, max_width: int) -> List[str]:
+    """
+    Greedy pixel-based word wrap. Each word is measured once and line widths are
+    accumulated, so wrapping is linear in the number of words.
+    """
+    space = text_width(" ", font)
+    lines, line, line_width = [], [], 0.0
+    for word in text.split():
+        word_width = text_width(word, font)
+        new_width = line_width + space + word_width if line else word_width
+        if new_width <= max_width or not line:
+            line.append(word)
+            line_width = new_width
+        else:
+            lines.append(" ".join(line))
+            line, line_width = [word], word_width
+    if line:
+        lines.append(" ".join(line))
+    return lines
+
+
+def render_header_png(title: str, desc: str, style: Dict[str, Any]) -> bytes:
+    """
+    Render a section header image (centered title and description) as PNG bytes.
+
+    Args:
+        title (str): Section title, drawn in the title font.
+        desc (str): Section description, drawn below the title.
+        style (dict): Dimensions, colors and fonts, see CentralBankGoogleFormGenerator.HEADER_STYLE.
+
+    Returns:
+        bytes: The encoded PNG.
+    """
+    img_width = style["width"]
+    img_height = style["height"]
+    padding = style["padding"]
+    spacing = style["spacing"]
+
+    font_title = get_font(*style["title_font"])
+    font_desc = get_font(*style["desc_font"])
+
+    # Pixel-based wrapping
+    max_text_width = img_width - 2 * padding
+    title_lines = wrap_text(title, font_title, max_text_width)
+    desc_lines = wrap_text(desc, font_desc, max_text_width)
+
+    # Calculate vertical placement
+    title_heights = [text_height(line, font_title) for line in title_lines]
+    desc_heights = [text_height(line, font_desc) for line in desc_lines]
+    total_title_height = sum(title_heights) + (len(title_lines)-1)*spacing
+    total_desc_height = sum(desc_heights) + (len(desc_lines)-1)*spacing
+    total_text_height = total_title_height + spacing + total_desc_height
+
+    # Center text block vertically
+    y = (img_height - total_text_height) // 2
+
+    # Create image
+    img = Image.new("RGB", (img_width, img_height), style["bg_color"])
+    draw = ImageDraw.Draw(img)
+
+    # Draw title (centered)
+    for i, line in enumerate(title_lines):
+        w = text_width(line, font_title)
+        x = (img_width - w) // 2
+        draw.text((x, y), line, font=font_title, fill=style["title_color"])
+        y += title_heights[i] + spacing
+
+    # Draw description (centered)
+    for i, line in enumerate(desc_lines):
+        w = text_width(line, font_desc)
+        x = (img_width - w) // 2
+        draw.text((x, y), line, font=font_desc, fill=style["desc_color"])
+        y += desc_heights[i] + spacing
+
+    # Optional: Add a subtle border
+    draw.rectangle([0, 0, img_width-1, img_height-1], outline=style["border_color"], width=2)
+
+    out = _png_buffer()
+    img.save(out, format="PNG")
+    return out.getvalue()
@@ -0,0 +1,79 @@
+import time
+
+from googleapiclient.errors import HttpError
+from googleapiclient.http import BatchHttpRequest, HttpRequest
+
+from .ApiClientRegistry import registry
+from .ApiMetrics import metrics
+
+
+def _body_size(body) -> int:
+    return len(body) if isinstance(body, (bytes, bytearray, str)) else 0
+
+
+def _throttle(method_id: str, calls: int = 1) -> None:
+    # Waiting for the shared budget is not counted as API latency
+    limiter = registry.limiter((method_id or "").split(".")[0])
+    if limiter is not None:
+        limiter.acquire(calls)
+
+
+class InstrumentedHttpRequest(HttpRequest):
+    """
+    HttpRequest that reports every execute() to `metrics`, after taking its API's
+    token from the registry's limiter for it, if it has one.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._response_bytes = 0
+        postproc = self.postproc
+
+        def measured_postproc(resp, content):
+            self._response_bytes = _body_size(content)
+            return postproc(resp, content)
+
+        self.postproc = measured_postproc
+
+    def execute(self, http=None, num_retries=0):
+        _throttle(self.methodId)
+        request_bytes = _body_size(self.body) + ((self.resumable.size() or 0) if self.resumable else 0)
+        status = 0
+        started = time.perf_counter()
+        try:
+            result = super().execute(http=http, num_retries=num_retries)
+            status = 200
+            return result
+        except HttpError as e:
+            status = e.resp.status
+            self._response_bytes = _body_size(e.content)
+            raise
+        finally:
+            metrics.record(self.methodId, time.perf_counter() - started, request_bytes, self._response_bytes, status)
+
+
+class InstrumentedBatchHttpRequest(BatchHttpRequest):
+    """
+    BatchHttpRequest that reports the round trip and each call in it to `metrics`.
+    """
+
+    def _execute(self, http, order, requests):
+        method_ids = [requests[request_id].methodId for request_id in order]
+        if method_ids:
+            _throttle(method_ids[0], len(method_ids))
+        started = time.perf_counter()
+        status = 0
+        try:
+            super()._execute(http, order, requests)
+            status = 200
+        except HttpError as e:
+            status = e.resp.status
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            service = (method_ids[0] or "unknown").split(".")[0] if method_ids else "unknown"
+            metrics.record(f"{service}.batch", elapsed, status=status, quota_units=0)
+            for request_id, method_id in zip(order, method_ids):
+                resp, content = self._responses.get(request_id, (None, None))
+                metrics.record(method_id, elapsed, _body_size(requests[request_id].body), _body_size(content),
+                               resp.status if resp is not None else status)
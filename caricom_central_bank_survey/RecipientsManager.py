@@ -1,34 +1,92 @@
-# Define the class first
+import csv
+import hashlib
+import logging
+import os
+import re
+from typing import Any, Dict, Iterator, List, Union
+
+logger = logging.getLogger(__name__)
+
+
 class RecipientsManager:
     """
     Handles loading and structuring recipient data for survey invites/reminders.
+
+    The manager is the single recipients source for every consumer (distributor,
+    reminder scheduler, confirmation listing). The CSV file(s) are read once, on first
+    use, into a list of validated, normalized records {"institution", "contact_name",
+    "emails"} that every consumer after that reuses.
+
+    Addresses are lowercased and checked against EMAIL_PATTERN. Each address is kept
+    once (first occurrence wins), tracked during the pass by an 8-byte digest rather
+    than the address itself. Malformed addresses are counted and the first
+    MAX_REPORTED of them kept in `malformed` as (file, line, institution, address).
     """
-    def __init__(self, csv_path):
-        self.csv_path = csv_path
-        self.recipients = self._load_recipients(self.csv_path)
-
-
-    def _load_recipients(self, file_path: str) -> list:
-        recipients = []
-        with open(self.csv_path, newline='', encoding='utf-8-sig') as csvfile:
-            reader = csv.DictReader(csvfile)
-            for row in reader:
-                recipients.append({
-                    "institution": row["institution"],
-                    "contact_name": row["contact_name"],
-                    "emails": [e.strip() for e in row["emails"].split(",") if e.strip()]
-                })
-        return recipients
+    EMAIL_PATTERN = re.compile(r"^[^@\s,;<>()\[\]]+@[a-z0-9](?:[a-z0-9-]*[a-z0-9])?(?:\.[a-z0-9](?:[a-z0-9-]*[a-z0-9])?)+$")
+    EMAIL_SEPARATORS = re.compile(r"[,;\s]+")
+    MAX_REPORTED = 100
+
+    def __init__(self, csv_path: Union[str, List[str]]):
+        if not csv_path:
+            raise ValueError("No recipients CSV given; set CSV_PATH or pass csv_path.")
+        # Several registries: a list, or paths joined with os.pathsep (as in CSV_PATH)
+        self.csv_paths = csv_path.split(os.pathsep) if isinstance(csv_path, str) else list(csv_path)
+        self.csv_path = self.csv_paths[0]
+        self.stats = {}
+        self.malformed = []
+        self._recipients = None
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(self.get_all())
+
+    def _read(self) -> Iterator[Dict[str, Any]]:
+        seen = set()
+        stats = {"rows": 0, "recipients": 0, "emails": 0, "duplicates": 0, "malformed": 0}
+        malformed = []
+        for path in self.csv_paths:
+            with open(path, newline='', encoding='utf-8-sig') as csvfile:
+                reader = csv.DictReader(csvfile)
+                for row in reader:
+                    stats["rows"] += 1
+                    institution = (row.get("institution") or "").strip()
+                    emails = []
+                    for email in self.EMAIL_SEPARATORS.split((row.get("emails") or "").strip().lower()):
+                        if not email:
+                            continue
+                        if not self.EMAIL_PATTERN.match(email):
+                            stats["malformed"] += 1
+                            if len(malformed) < self.MAX_REPORTED:
+                                malformed.append((path, reader.line_num, institution, email))
+                            continue
+                        digest = hashlib.blake2b(email.encode("utf-8"), digest_size=8).digest()
+                        if digest in seen:
+                            stats["duplicates"] += 1
+                            continue
+                        seen.add(digest)
+                        emails.append(email)
+                    if not emails:
+                        continue
+                    stats["recipients"] += 1
+                    stats["emails"] += len(emails)
+                    yield {
+                        "institution": institution,
+                        "contact_name": (row.get("contact_name") or "").strip(),
+                        "emails": emails
+                    }
+
+        self.stats, self.malformed = stats, malformed
+        logger.info(f"Recipients: {stats['emails']} address(es) for {stats['recipients']} institution row(s); "
+                    f"{stats['duplicates']} duplicate(s) dropped, {stats['malformed']} malformed")
+        for path, line, institution, email in malformed:
+            logger.warning(f"Malformed address '{email}' for {institution or 'unknown institution'} ({path}:{line})")
 
     def get_all(self):
-        return self.recipients
+        if self._recipients is None:
+            self._recipients = list(self._read())
+        return self._recipients
 
     def get_by_institution(self, name):
-        return [r for r in self.recipients if r["institution"].lower() == name.lower()]
+        return [r for r in self if r["institution"].lower() == name.lower()]
 
     def get_all_emails(self):
-        return [email for r in self.recipients for email in r["emails"]]
-
-# Now instantiate after the class is defined
-manager = RecipientsManager(csv_path=CSV_PATH)
-
+        return [email for r in self for email in r["emails"]]
@@ -1,8 +1,194 @@
+import asyncio
+import logging
+import os
+import sqlite3
+import time
+from typing import Any, Dict, List, Optional
+
+from .ApiMetrics import metrics
+from .EmailTemplateManager import EmailTemplateManager
+from .GmailSendEngine import GmailSendEngine
+from .ResponseIndex import ResponseIndex
+
+logger = logging.getLogger(__name__)
+
+
 class ReminderSystem:
-    def setup_schedule(self, recipients, delay_days=3):
+    """
+    Persistent reminder scheduler.
+
+    Due reminders live in an on-disk SQLite table indexed by (status, due_at), which
+    acts as a priority queue: `process_due` pops everything that is due in batches and
+    sends it through GmailSendEngine's HTTP batch path, and `run` keeps doing so from a
+    long-lived asyncio loop that sleeps until the next reminder falls due.
+
+    Given a Forms service, each run first refreshes a ResponseIndex per form and
+    skips reminders to institutions or addresses that have already responded.
+    """
+    BATCH_SIZE = 50
+    POLL_INTERVAL_SECONDS = 300
+
+    def __init__(self, form_id: str = None, creds=None, template_mgr: EmailTemplateManager = None,
+                 db_path: str = None, send_engine: GmailSendEngine = None, forms_service=None):
+        self.form_id = form_id or ""
+        self.creds = creds
+        self.template_mgr = template_mgr or EmailTemplateManager()
+        self.send_engine = send_engine
+        self.forms = forms_service
+        self._response_indexes = {}
+        self.db_path = db_path or os.getenv("REMINDER_DB_PATH") or "reminders.sqlite3"
+        # process_due may run on a worker thread under `run`; only one thread uses it at a time
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS reminders (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                form_id TEXT NOT NULL,
+                recipient TEXT NOT NULL,
+                institution TEXT,
+                due_at REAL NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                sent_at REAL,
+                error TEXT
+            );
+            CREATE INDEX IF NOT EXISTS reminders_due ON reminders (status, due_at);
+            -- Older databases may hold several pending reminders per address; keep the earliest
+            DELETE FROM reminders WHERE status = 'pending' AND EXISTS (
+                SELECT 1 FROM reminders AS earlier
+                WHERE earlier.status = 'pending' AND earlier.form_id = reminders.form_id
+                  AND earlier.recipient = reminders.recipient
+                  AND (earlier.due_at < reminders.due_at OR (earlier.due_at = reminders.due_at AND earlier.id < reminders.id))
+            );
+            CREATE UNIQUE INDEX IF NOT EXISTS reminders_pending
+                ON reminders (form_id, recipient) WHERE status = 'pending';
+        """)
+        self.conn.commit()
+
+    def setup_schedule(self, recipients, delay_days=3) -> int:
         """
-        Simulate scheduling email reminders after a delay.
+        Schedule one reminder per recipient address, `delay_days` from now. An address
+        that already has a pending reminder for this form keeps it and gets no second one.
+
+        Returns:
+            int: Number of reminders newly added to the queue.
         """
-        for r in recipients:
-            for email in r["emails"]:
-                print(f"Scheduled reminder to {email} in {delay_days} days (simulated)")
+        due_at = time.time() + delay_days * 86400
+        rows = [
+            (self.form_id, email.strip().lower(), r["institution"], due_at)
+            for r in recipients
+            for email in r["emails"]
+        ]
+        before = self.conn.total_changes
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO reminders (form_id, recipient, institution, due_at) VALUES (?, ?, ?, ?)",
+            rows
+        )
+        self.conn.commit()
+        added = self.conn.total_changes - before
+        print(f"⏰ Scheduled {added} reminder(s) in {delay_days} days")
+        return added
+
+    def next_due_at(self) -> Optional[float]:
+        row = self.conn.execute(
+            "SELECT MIN(due_at) FROM reminders WHERE status = 'pending'"
+        ).fetchone()
+        return row[0]
+
+    def _response_index(self, form_id: str, refreshed: set) -> Optional[ResponseIndex]:
+        if self.forms is None or not form_id:
+            return None
+        index = self._response_indexes.get(form_id)
+        if index is None:
+            index = self._response_indexes[form_id] = ResponseIndex(self.forms, form_id)
+        if form_id not in refreshed:
+            index.refresh()
+            refreshed.add(form_id)
+        return index
+
+    def _pop_due(self, now: float) -> List[tuple]:
+        return self.conn.execute(
+            "SELECT id, form_id, recipient, institution FROM reminders "
+            "WHERE status = 'pending' AND due_at <= ? ORDER BY due_at LIMIT ?",
+            (now, self.BATCH_SIZE)
+        ).fetchall()
+
+    @metrics.stage("reminders")
+    def process_due(self, now: float = None) -> List[Dict[str, Any]]:
+        """
+        Send every reminder that is due, in batches of BATCH_SIZE.
+
+        Returns:
+            list: Send result records, one per reminder processed.
+        """
+        now = now or time.time()
+        if self.send_engine is None:
+            if self.creds is None:
+                raise RuntimeError("ReminderSystem needs creds or a send_engine to send reminders.")
+            self.send_engine = GmailSendEngine(self.creds)
+
+        results, refreshed, skipped = [], set(), []
+        while True:
+            due = self._pop_due(now)
+            if not due:
+                break
+            # Per form: recipient -> reminder rows, and the messages to send
+            row_ids, messages = {}, {}
+            for row_id, form_id, recipient, institution in due:
+                index = self._response_index(form_id, refreshed)
+                if index and index.has_responded(institution, recipient):
+                    skipped.append(row_id)
+                    self.conn.execute("UPDATE reminders SET status = 'responded' WHERE id = ?", (row_id,))
+                    continue
+                form_rows = row_ids.setdefault(form_id, {})
+                if recipient in form_rows:
+                    # Several due reminders for one address and form collapse into a single email
+                    form_rows[recipient].append(row_id)
+                    continue
+                form_rows[recipient] = [row_id]
+                messages.setdefault(form_id, []).append({"to": recipient, "raw": self.template_mgr.render_raw(
+                    "survey_reminder",
+                    to=recipient,
+                    subject="Reminder: CARICOM Survey",
+                    name=institution,
+                    survey_title="CARICOM Regional FMI Survey",
+                    form_url=f"https://docs.google.com/forms/d/{form_id}"
+                )})
+
+            def mark(result, form_rows):
+                # Persist each outcome as soon as it is known so a crash never re-sends it
+                self.conn.executemany(
+                    "UPDATE reminders SET status = ?, attempts = attempts + ?, sent_at = ?, error = ? WHERE id = ?",
+                    [(result["status"], result["attempts"], time.time() if result["status"] == "sent" else None,
+                      result["error"], row_id) for row_id in form_rows[result["to"]]]
+                )
+                self.conn.commit()
+
+            self.conn.commit()
+            # One send per form, so an address due reminders for several forms gets each of them
+            for form_id, form_messages in messages.items():
+                results.extend(self.send_engine.send_batched(
+                    form_messages, on_result=lambda result, form_rows=row_ids[form_id]: mark(result, form_rows)
+                ))
+
+        if skipped:
+            print(f"⏭️ Skipped {len(skipped)} reminder(s) to institutions that already responded")
+        if results:
+            sent = sum(1 for r in results if r["status"] == "sent")
+            print(f"📨 Sent {sent}/{len(results)} due reminder(s)")
+        return results
+
+    async def run(self, poll_interval: float = None) -> None:
+        """
+        Long-lived loop: send due reminders, then sleep until the next one is due
+        (re-checking at least every `poll_interval` seconds for newly scheduled ones).
+        """
+        poll_interval = poll_interval or self.POLL_INTERVAL_SECONDS
+        while True:
+            await asyncio.to_thread(self.process_due)
+            next_due = self.next_due_at()
+            delay = poll_interval if next_due is None else min(poll_interval, max(0.0, next_due - time.time()))
+            await asyncio.sleep(delay)
+
+    def run_forever(self, poll_interval: float = None) -> None:
+        asyncio.run(self.run(poll_interval))
@@ -0,0 +1,96 @@
+import json
+import logging
+import os
+import re
+from typing import Optional
+
+from .ResponseIngestor import ResponseIngestor
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseIndex:
+    """
+    Index of who has already answered a form: normalized institution names (from the
+    "name of your institution" question) and respondent emails.
+
+    `refresh` polls the form's ResponseIngestor (which only fetches new responses) and
+    indexes whatever was appended to the local store since the last refresh. The index
+    and its store offset are persisted between runs, so each reminder run costs about
+    the same regardless of how many responses have come in.
+    """
+    INSTITUTION_QUESTION = "name of your institution"
+
+    def __init__(self, forms_service, form_id: str, ingestor: ResponseIngestor = None, state_path: str = None):
+        self.forms = forms_service
+        self.form_id = form_id
+        self.ingestor = ingestor or ResponseIngestor(forms_service, form_id)
+        self.state_path = state_path or os.path.join(self.ingestor.data_dir, f"{form_id}.index.json")
+        state = self._load()
+        self.question_id = state.get("question_id")
+        self.offset = state.get("offset", 0)
+        self.institutions = set(state.get("institutions", []))
+        self.emails = set(state.get("emails", []))
+
+    @staticmethod
+    def normalize(name: str) -> str:
+        name = re.sub(r"[^\w\s]", " ", (name or "").casefold())
+        name = re.sub(r"^the\s+", "", name.strip())
+        return re.sub(r"\s+", " ", name).strip()
+
+    def has_responded(self, institution: str = None, email: str = None) -> bool:
+        if email and email.strip().lower() in self.emails:
+            return True
+        return bool(institution) and self.normalize(institution) in self.institutions
+
+    def refresh(self) -> int:
+        """
+        Poll for new responses and add everything not yet indexed.
+
+        Returns:
+            int: Number of newly indexed responses.
+        """
+        if self.question_id is None:
+            self.question_id = self._find_institution_question()
+        self.ingestor.poll()
+
+        new = 0
+        for response, offset in self.ingestor.read(self.offset):
+            self.offset = offset
+            new += 1
+            if response.get("respondentEmail"):
+                self.emails.add(response["respondentEmail"].strip().lower())
+            answer = response.get("answers", {}).get(self.question_id, {})
+            for text in answer.get("textAnswers", {}).get("answers", []):
+                if text.get("value"):
+                    self.institutions.add(self.normalize(text["value"]))
+
+        self._save()
+        logger.info(f"Response index for {self.form_id}: {new} new, {len(self.institutions)} institutions responded")
+        return new
+
+    def _find_institution_question(self) -> Optional[str]:
+        form = self.forms.forms().get(formId=self.form_id).execute()
+        for item in form.get("items", []):
+            question = item.get("questionItem", {}).get("question")
+            if question and self.INSTITUTION_QUESTION in item.get("title", "").lower():
+                return question["questionId"]
+        logger.warning(f"Form {self.form_id} has no '{self.INSTITUTION_QUESTION}' question; matching by email only")
+        return None
+
+    def _load(self) -> dict:
+        if not os.path.exists(self.state_path):
+            return {}
+        with open(self.state_path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def _save(self) -> None:
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "question_id": self.question_id,
+                "offset": self.offset,
+                "institutions": sorted(self.institutions),
+                "emails": sorted(self.emails),
+            }, f, indent=2)
+        os.replace(tmp_path, self.state_path)
@@ -0,0 +1,175 @@
+import logging
+import os
+from datetime import datetime
+from typing import Any, Dict, List
+
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from .FormSynchronizer import question_schema
+from .ResponseIngestor import ResponseIngestor
+
+logger = logging.getLogger(__name__)
+
+
+def read_store(path: str, memory_map: bool = True) -> pa.Table:
+    """
+    Memory-map a response store written by `ResponseStore`; nothing is parsed or copied.
+
+    With `memory_map` False the file is read into memory instead, so the table holds no
+    reference to it and the file can be replaced while the table is in use (Windows
+    refuses to replace a file that is still mapped).
+    """
+    with (pa.memory_map(path, "r") if memory_map else pa.OSFile(path, "rb")) as source:
+        return pa.ipc.open_file(source).read_all()
+
+
+class ResponseStore:
+    """
+    Columnar copy of a form's responses: one row per response (latest edit wins) and
+    one column per question ID.
+
+    Scale answers are stored as int8, single-choice answers as dictionary-encoded
+    categoricals over the question's options, checkbox answers as lists of strings and
+    text answers as strings. Question metadata (title, section, kind, bounds) travels
+    in each field's metadata, so readers need neither the generator nor the form.
+
+    The store is an uncompressed Arrow IPC file, so `load` memory-maps it instead of
+    parsing anything. `update` folds in whatever the ResponseIngestor appended to its
+    JSONL store since the last update; the JSONL offset is kept in the file's schema
+    metadata so store and offset are replaced together.
+    """
+    META_COLUMNS = ("response_id", "respondent_email", "submitted_at")
+
+    def __init__(self, ingestor: ResponseIngestor, section_definitions: List[Dict[str, Any]], path: str = None):
+        self.ingestor = ingestor
+        self.questions = question_schema(section_definitions)
+        self.path = path or os.path.join(ingestor.data_dir, f"{ingestor.form_id}.arrow")
+        self.schema = pa.schema(
+            [
+                pa.field("response_id", pa.string(), nullable=False),
+                pa.field("respondent_email", pa.string()),
+                pa.field("submitted_at", pa.timestamp("us", tz="UTC")),
+            ] + [self._question_field(q) for q in self.questions],
+            metadata={"form_id": ingestor.form_id}
+        )
+
+    @staticmethod
+    def _question_field(question: Dict[str, Any]) -> pa.Field:
+        meta = {"title": question["title"], "section": question["section"], "kind": question["kind"]}
+        if question["kind"] == "scale":
+            meta.update(low=str(question["low"]), high=str(question["high"]))
+            type_ = pa.int8()
+        elif question["kind"] == "choice":
+            type_ = pa.dictionary(pa.int16(), pa.string())
+        elif question["kind"] == "checkbox":
+            type_ = pa.list_(pa.string())
+        else:
+            type_ = pa.string()
+        return pa.field(question["question_id"], type_, metadata=meta)
+
+    def load(self) -> pa.Table:
+        """
+        Memory-map the store.
+
+        Returns:
+            pyarrow.Table: All stored responses; empty (with the full schema) if nothing was stored yet.
+        """
+        if not os.path.exists(self.path):
+            return self.schema.empty_table()
+        return read_store(self.path)
+
+    def update(self) -> int:
+        """
+        Add responses the ingestor stored since the last update.
+
+        The store is rebuilt from the start of the JSONL file if the question schema
+        changed since it was written.
+
+        Returns:
+            int: Number of response records read (edits of stored responses included).
+        """
+        # Read into memory: the rewritten table replaces this very file
+        table, offset = self.schema.empty_table(), 0
+        if os.path.exists(self.path):
+            table = read_store(self.path, memory_map=False)
+            if table.schema.remove_metadata().equals(self.schema.remove_metadata(), check_metadata=False):
+                offset = int((table.schema.metadata or {}).get(b"offset", 0))
+            else:
+                logger.info(f"Question schema of {self.path} changed; rebuilding response store")
+                table = self.schema.empty_table()
+
+        records = []
+        for response, offset in self.ingestor.read(offset):
+            records.append(response)
+        if not records and os.path.exists(self.path):
+            return 0
+
+        new = self._to_table(records)
+        if table.num_rows:
+            # Re-submitted (edited) responses replace their earlier row
+            keep = pc.invert(pc.is_in(table.column("response_id"), value_set=new.column("response_id").combine_chunks()))
+            table = pa.concat_tables([table.filter(keep), new]).unify_dictionaries().combine_chunks()
+        else:
+            table = new
+        self._write(table, offset)
+        logger.info(f"Response store {self.path}: {len(records)} record(s) added, {table.num_rows} response(s) total")
+        return len(records)
+
+    def _to_table(self, records: List[Dict[str, Any]]) -> pa.Table:
+        # Keep the last record per responseId within this batch too
+        latest = {r.get("responseId"): r for r in records}
+        rows = list(latest.values())
+        columns = [
+            pa.array([r.get("responseId") for r in rows], pa.string()),
+            pa.array([r.get("respondentEmail") for r in rows], pa.string()),
+            pa.array([self._timestamp(r.get("lastSubmittedTime")) for r in rows], pa.timestamp("us", tz="UTC")),
+        ]
+        for question in self.questions:
+            values = [self._answer_values(r, question["question_id"]) for r in rows]
+            columns.append(self._column(question, values))
+        return pa.Table.from_arrays(columns, schema=self.schema)
+
+    @staticmethod
+    def _answer_values(response: Dict[str, Any], question_id: str) -> List[str]:
+        answer = response.get("answers", {}).get(question_id, {})
+        return [a["value"] for a in answer.get("textAnswers", {}).get("answers", []) if "value" in a]
+
+    @staticmethod
+    def _column(question: Dict[str, Any], values: List[List[str]]) -> pa.Array:
+        kind = question["kind"]
+        if kind == "checkbox":
+            return pa.array([v or None for v in values], pa.list_(pa.string()))
+        first = [v[0] if v else None for v in values]
+        if kind == "scale":
+            return pa.array([int(v) if v is not None else None for v in first], pa.int8())
+        if kind == "choice":
+            # Fixed category order from the form; "Other" free text is appended after it
+            categories = list(question["options"])
+            codes = {value: i for i, value in enumerate(categories)}
+            for value in first:
+                if value is not None and value not in codes:
+                    codes[value] = len(categories)
+                    categories.append(value)
+            indices = pa.array([codes[v] if v is not None else None for v in first], pa.int16())
+            return pa.DictionaryArray.from_arrays(indices, pa.array(categories, pa.string()))
+        return pa.array(first, pa.string())
+
+    @staticmethod
+    def _timestamp(value: str):
+        if not value:
+            return None
+        # RFC 3339 with up to nanosecond precision; microseconds are plenty here
+        head, _, frac = value.rstrip("Z").partition(".")
+        return datetime.fromisoformat(f"{head}.{(frac or '0')[:6].ljust(6, '0')}+00:00")
+
+    def _write(self, table: pa.Table, offset: int) -> None:
+        # Rebind to the current schema so field metadata follows wording changes
+        table = pa.Table.from_arrays(table.columns, schema=self.schema.with_metadata(
+            {**self.schema.metadata, b"offset": str(offset).encode()}
+        ))
+        tmp_path = f"{self.path}.tmp"
+        with pa.OSFile(tmp_path, "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp_path, self.path)
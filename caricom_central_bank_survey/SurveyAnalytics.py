@@ -0,0 +1,188 @@
+import logging
+import os
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from .ResponseIndex import ResponseIndex
+from .ResponseStore import read_store
+
+logger = logging.getLogger(__name__)
+
+
+class SurveyAnalytics:
+    """
+    Readiness analytics over one or more response stores (one per survey wave).
+
+    On construction every scale column of every wave is stacked into a single float
+    matrix (respondents x scale questions, NaN where unanswered), alongside the wave
+    and normalized jurisdiction of each row. All statistics are then whole-matrix
+    numpy/pandas operations; nothing loops over respondents, so rebuilding the
+    dashboard after a new response costs a memory-map and a few array passes.
+
+    Jurisdictions are taken from the "name of your institution" answer, normalized
+    like ResponseIndex does for reminders.
+    """
+
+    def __init__(self, waves: Dict[str, pa.Table]):
+        self.waves = list(waves)
+        self.scale_questions = self._collect_questions(waves.values(), "scale")
+        self.choice_questions = self._collect_questions(waves.values(), "choice")
+        self.question_ids = [q["question_id"] for q in self.scale_questions]
+
+        blocks, wave_col, names = [], [], []
+        for label, table in waves.items():
+            blocks.append(np.column_stack([self._scale_column(table, qid) for qid in self.question_ids])
+                          if self.question_ids else np.empty((table.num_rows, 0), np.float64))
+            wave_col.append(np.full(table.num_rows, label, dtype=object))
+            names.append(self._institution_column(table))
+        self.scale = np.concatenate(blocks) if blocks else np.empty((0, len(self.question_ids)), np.float64)
+        self.wave = np.concatenate(wave_col) if wave_col else np.empty(0, object)
+
+        raw = pd.concat(names, ignore_index=True) if names else pd.Series([], dtype=object)
+        self.jurisdiction = self._normalize(raw)
+        # Display name per jurisdiction: the first spelling seen
+        self.jurisdiction_names = raw.str.strip().groupby(self.jurisdiction.values).first()
+        self._tables = waves
+
+    @classmethod
+    def from_stores(cls, paths: List[str]) -> "SurveyAnalytics":
+        """
+        Memory-map each store; waves are labelled with the form ID they were ingested from.
+        """
+        waves = {}
+        for path in paths:
+            table = read_store(path)
+            label = (table.schema.metadata or {}).get(b"form_id", b"").decode() or os.path.basename(path)
+            waves[label] = table
+        return cls(waves)
+
+    @staticmethod
+    def _collect_questions(tables, kind: str) -> List[Dict[str, Any]]:
+        questions = {}
+        for table in tables:
+            for field in table.schema:
+                meta = {k.decode(): v.decode() for k, v in (field.metadata or {}).items()}
+                if meta.get("kind") == kind and field.name not in questions:
+                    meta["question_id"] = field.name
+                    if kind == "scale":
+                        meta["low"], meta["high"] = int(meta["low"]), int(meta["high"])
+                    questions[field.name] = meta
+        return list(questions.values())
+
+    @staticmethod
+    def _scale_column(table: pa.Table, question_id: str) -> np.ndarray:
+        if question_id not in table.column_names:
+            return np.full(table.num_rows, np.nan, np.float64)
+        # Nulls become NaN on the way out of Arrow
+        return table.column(question_id).to_numpy().astype(np.float64)
+
+    @staticmethod
+    def _institution_column(table: pa.Table) -> pd.Series:
+        for field in table.schema:
+            title = (field.metadata or {}).get(b"title", b"").decode().lower()
+            if ResponseIndex.INSTITUTION_QUESTION in title:
+                return pd.Series(table.column(field.name).to_pandas(), dtype=object).fillna("")
+        logger.warning("Response store has no institution question; all rows count as one jurisdiction")
+        return pd.Series([""] * table.num_rows, dtype=object)
+
+    @staticmethod
+    def _normalize(names: pd.Series) -> pd.Series:
+        """Vectorized ResponseIndex.normalize."""
+        names = names.str.casefold().str.replace(r"[^\w\s]", " ", regex=True).str.strip()
+        names = names.str.replace(r"^the\s+", "", regex=True)
+        return names.str.replace(r"\s+", " ", regex=True).str.strip()
+
+    @property
+    def _row_index(self) -> pd.MultiIndex:
+        return pd.MultiIndex.from_arrays([self.wave, self.jurisdiction.values], names=["wave", "jurisdiction"])
+
+    def distributions(self) -> pd.DataFrame:
+        """
+        Answer counts per scale question (rows) and scale value (columns).
+        """
+        if not self.scale_questions:
+            return pd.DataFrame()
+        values = np.arange(min(q["low"] for q in self.scale_questions),
+                           max(q["high"] for q in self.scale_questions) + 1)
+        counts = (self.scale[:, :, None] == values[None, None, :]).sum(axis=0)
+        return pd.DataFrame(counts, index=pd.Index(self.question_ids, name="question_id"), columns=values)
+
+    def medians(self) -> pd.Series:
+        """
+        Median answer per scale question, ignoring unanswered; NaN where nobody answered.
+        """
+        answered = ~np.isnan(self.scale).all(axis=0)
+        medians = np.full(len(self.question_ids), np.nan)
+        medians[answered] = np.nanmedian(self.scale[:, answered], axis=0)
+        return pd.Series(medians, index=pd.Index(self.question_ids, name="question_id"))
+
+    def jurisdiction_matrix(self) -> pd.DataFrame:
+        """
+        Mean answer per (wave, jurisdiction) and scale question.
+        """
+        frame = pd.DataFrame(self.scale, index=self._row_index, columns=self.question_ids)
+        return frame.groupby(level=["wave", "jurisdiction"], sort=True).mean()
+
+    def section_scores(self) -> pd.DataFrame:
+        """
+        Readiness score (0-100) per (wave, jurisdiction) and section.
+
+        Each scale answer is rescaled to 0-1 within its own bounds; a respondent's section
+        score is the mean over the section questions they answered, and a jurisdiction's
+        score is the mean over its respondents.
+        """
+        low = np.array([q["low"] for q in self.scale_questions], np.float64)
+        span = np.array([q["high"] - q["low"] for q in self.scale_questions], np.float64)
+        sections = list(dict.fromkeys(q["section"] for q in self.scale_questions))
+        membership = np.zeros((len(self.question_ids), len(sections)), np.float64)
+        membership[np.arange(len(self.question_ids)), [sections.index(q["section"]) for q in self.scale_questions]] = 1
+
+        rescaled = (self.scale - low) / span
+        answered = ~np.isnan(rescaled)
+        totals = np.where(answered, rescaled, 0) @ membership
+        counts = answered.astype(np.float64) @ membership
+        with np.errstate(invalid="ignore", divide="ignore"):
+            scores = np.where(counts > 0, totals / counts * 100, np.nan)
+
+        frame = pd.DataFrame(scores, index=self._row_index, columns=sections)
+        return frame.groupby(level=["wave", "jurisdiction"], sort=True).mean()
+
+    def choice_counts(self) -> Dict[str, pd.Series]:
+        """
+        Answer counts per single-choice question, in option order, summed over all waves.
+        """
+        results = {}
+        for question in self.choice_questions:
+            qid = question["question_id"]
+            counts = {}
+            for table in self._tables.values():
+                if qid not in table.column_names or table.num_rows == 0:
+                    continue
+                column = table.column(qid).combine_chunks()
+                # Null answers land in bin 0 and are dropped
+                bins = np.bincount(pc.fill_null(column.indices, -1).to_numpy() + 1,
+                                   minlength=len(column.dictionary) + 1)[1:]
+                for value, n in zip(column.dictionary.to_pylist(), bins.tolist()):
+                    counts[value] = counts.get(value, 0) + n
+            results[qid] = pd.Series(counts, dtype="int64")
+        return results
+
+    def dashboard(self) -> Dict[str, Any]:
+        """
+        Every statistic above in one dict, for rendering or export.
+        """
+        return {
+            "waves": self.waves,
+            "respondents": int(self.scale.shape[0]),
+            "jurisdictions": self.jurisdiction_names.to_dict(),
+            "questions": {q["question_id"]: q for q in self.scale_questions + self.choice_questions},
+            "distributions": self.distributions(),
+            "medians": self.medians(),
+            "jurisdiction_matrix": self.jurisdiction_matrix(),
+            "section_scores": self.section_scores(),
+            "choice_counts": self.choice_counts(),
+        }
@@ -1,61 +1,99 @@
-import base64
-import csv
-from email.mime.text import MIMEText
-from googleapiclient.discovery import build
-from config import CSV_PATH
+import logging
+
+import config
+from .ApiClientRegistry import get_service
+from .ApiMetrics import metrics
+from .DistributionJournal import DistributionJournal
+from .GmailSendEngine import GmailSendEngine
+from .RecipientsManager import RecipientsManager
+
+logger = logging.getLogger(__name__)
+
 
 class SurveyDistributor:
     """Handles survey distribution and Gmail-based alert delivery."""
 
-    def __init__(self, form_id: str, creds, template_mgr, csv_path: str = None):
+    def __init__(self, form_id: str, creds, template_mgr, csv_path: str = None, send_engine: GmailSendEngine = None,
+                 journal: DistributionJournal = None, recipients=None):
         self.form_id = form_id
         self.creds = creds
-        self.csv_path = csv_path or CSV_PATH
+        self.csv_path = csv_path or config.CSV_PATH
         self.form_url = f"https://docs.google.com/forms/d/{form_id}"
-        self.recipients = self._load_recipients()
-        self.gmail = build("gmail", "v1", credentials=creds)
+        # Any iterable of recipient records; by default the CSV is read on first use
+        self.recipients = recipients if recipients is not None else RecipientsManager(self.csv_path)
         self.template_mgr = template_mgr
+        self.send_engine = send_engine or GmailSendEngine(creds)
+        self.journal = journal or DistributionJournal()
 
-    def _load_recipients(self) -> list:
-        recipients = []
-        with open(self.csv_path, encoding="utf-8-sig") as file:
-            reader = csv.DictReader(file)
-            for row in reader:
-                recipients.append({
-                    "institution": row["institution"].strip(),
-                    "contact_name": row["contact_name"].strip(),
-                    "emails": [email.strip() for email in row["emails"].split(",") if email.strip()]
-                })
-        return recipients
-
-    def send_email(self, to: str, subject: str, body: str) -> None:
-        print(f"DEBUG: to={to}, subject={subject}, body={body[:100]}")
-        message = MIMEText(body, "html")
-        message["to"] = to
-        message["from"] = "me"
-        message["subject"] = subject
-    
-        raw = base64.urlsafe_b64encode(message.as_bytes()).decode()
-        try:
-            self.gmail.users().messages().send(userId="me", body={"raw": raw}).execute()
+    @property
+    def gmail(self):
+        return get_service("gmail", "v1", self.creds)
+
+    def send_email(self, to: str, subject: str, body: str) -> dict:
+        logger.debug(f"Sending '{subject}' to {to}")
+        result = self.send_engine.send_one({"to": to, "subject": subject, "body": body})
+        if result["status"] == "sent":
             print(f"✅ Sent email to {to}")
-        except Exception as e:
-            import traceback
-            print(f"❌ Failed to send email to {to}: {e}")
-            traceback.print_exc()
+        else:
+            print(f"❌ Failed to send email to {to}: {result['error']}")
+        return result
+
+
+    @metrics.stage("distribution")
+    def distribute_survey(self, batch: bool = False, on_result=None) -> list:
+        """
+        Send the survey invitation to every recipient address.
 
+        Addresses the distribution journal already records as sent for this form are
+        skipped, so an interrupted run can simply be started again.
 
-    def distribute_survey(self):
+        Args:
+            batch (bool): Dispatch through Gmail HTTP batch requests instead of concurrent single sends.
+            on_result (callable): Also called with each send result once it is journaled, e.g. to report progress.
+
+        Returns:
+            list: One send result record per address sent in this run.
+        """
         print("Distributing survey to recipients:\n")
-        for entry in self.recipients:
-            print(f"{entry['institution']}: {', '.join(entry['emails'])}")
-            for email in entry["emails"]:
-                body = self.template_mgr.render(
-                    "survey_invite",
-                    name=entry["institution"],
-                    survey_title="CARICOM Regional FMI Survey",
-                    form_url=self.form_url
-                )
-                self.send_email(to=email, subject="CARICOM Survey Invitation", body=body)
-        print(f"\n✅ Survey link: {self.form_url}")
+        template = "survey_invite"
+        done = self.journal.completed(self.form_id, template)
+        skipped = 0
+
+        def invitations():
+            # Rendered one at a time, as the send engine takes them
+            nonlocal skipped
+            for entry in self.recipients:
+                print(f"{entry['institution']}: {', '.join(entry['emails'])}")
+                for email in entry["emails"]:
+                    key = email.strip().lower()
+                    if key in done:
+                        skipped += 1
+                        continue
+                    done.add(key)
+                    yield {"to": email, "raw": self.template_mgr.render_raw(
+                        template,
+                        to=email,
+                        subject="CARICOM Survey Invitation",
+                        name=entry["institution"],
+                        survey_title="CARICOM Regional FMI Survey",
+                        form_url=self.form_url
+                    )}
 
+        def record(result):
+            self.journal.record(self.form_id, template, result)
+            if on_result:
+                on_result(result)
+
+        if batch:
+            results = self.send_engine.send_batched(invitations(), on_result=record)
+        else:
+            results = self.send_engine.send_all(invitations(), on_result=record)
+        if skipped:
+            print(f"\n⏭️ Skipped {skipped} address(es) already sent this invitation")
+        for result in results:
+            if result["status"] != "sent":
+                print(f"❌ Failed to send email to {result['to']} after {result['attempts']} attempt(s): {result['error']}")
+        sent = sum(1 for r in results if r["status"] == "sent")
+        print(f"\n📨 Sent {sent}/{len(results)} invitations")
+        print(f"\n✅ Survey link: {self.form_url}")
+        return results
@@ -0,0 +1,226 @@
+import copy
+import hashlib
+import json
+import logging
+import os
+from typing import Any, Dict, List, Tuple
+
+from .FormSynchronizer import FormSynchronizer
+from .HeaderImageCache import HeaderImageCache
+from .TextSanitizer import clean_form_text
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SURVEY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "surveys", "central_bank_survey.json")
+
+
+def _clean_strings(value):
+    if isinstance(value, str):
+        return clean_form_text(value)
+    if isinstance(value, list):
+        return [_clean_strings(v) for v in value]
+    if isinstance(value, dict):
+        return {k: v if k == "key" else _clean_strings(v) for k, v in value.items()}
+    return value
+
+
+class SurveyPlan:
+    """
+    A survey definition file compiled into the Forms requests that build it.
+
+    Definitions are JSON, or YAML if PyYAML is installed:
+    {"info": {"title", "documentTitle"}, "sections": [{"key", "title", "description",
+    "questions": [Forms item dicts, each with a "key"]}]}.
+
+    Every section and question needs a key, unique within the file, from which its
+    item and question IDs are derived. Keys must never change once a form is live:
+    they are what keeps responses attached to the right question across edits.
+
+    Compiling sanitizes every text, assigns the stable item and question IDs the
+    FormSynchronizer matches on, places a header image placeholder in every section
+    and computes every createItem index. The compiled plan is cached as JSON in
+    SURVEY_PLAN_CACHE_DIR, named after the SHA-256 of the definition file, so a build
+    from an unchanged file only reads it back.
+    """
+    # Bump when compile() changes, so plans cached by older code are not reused
+    FORMAT_VERSION = 3
+
+    def __init__(self, plan: Dict[str, Any]):
+        self.source_hash = plan["source_hash"]
+        self.info = plan["info"]
+        self.sections = plan["sections"]
+        self.requests = plan["requests"]
+        # Header image item ID -> (title, description) rendered into it, in form order
+        self.headers = {item_id: tuple(header) for item_id, header in plan["headers"].items()}
+
+    @classmethod
+    def load(cls, path: str = None, cache_dir: str = None) -> "SurveyPlan":
+        """
+        Return the compiled plan for a definition file, compiling it only if no cached plan matches.
+
+        Args:
+            path (str): Survey definition file; defaults to the bundled central bank survey.
+            cache_dir (str): Where compiled plans are kept (SURVEY_PLAN_CACHE_DIR, default survey_plan_cache).
+        """
+        path = path or DEFAULT_SURVEY_PATH
+        with open(path, "rb") as f:
+            content = f.read()
+        digest = hashlib.sha256(content).hexdigest()
+        cache_dir = cache_dir or os.getenv("SURVEY_PLAN_CACHE_DIR") or "survey_plan_cache"
+        cache_path = os.path.join(cache_dir, f"v{cls.FORMAT_VERSION}-{digest}.json")
+
+        if os.path.exists(cache_path):
+            try:
+                with open(cache_path, encoding="utf-8") as f:
+                    plan = json.load(f)
+                logger.info(f"Using cached survey plan {cache_path}")
+                return cls(plan)
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"Ignoring unreadable survey plan {cache_path}: {e}")
+
+        plan = cls.compile(cls.parse(content, path))
+        plan["source_hash"] = digest
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp_path = f"{cache_path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(plan, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_path, cache_path)
+            logger.info(f"Compiled {path} into {len(plan['requests'])} requests; cached as {cache_path}")
+        except OSError as e:
+            logger.warning(f"Could not cache survey plan in {cache_dir}: {e}")
+        return cls(plan)
+
+    @staticmethod
+    def parse(content: bytes, path: str = "") -> Dict[str, Any]:
+        """
+        Parse and check a definition file's content.
+
+        Raises:
+            ValueError: The definition is not a list of sections with titles and questions,
+                        or a section or question has no key or a key used twice.
+        """
+        if path.lower().endswith((".yaml", ".yml")):
+            try:
+                import yaml
+            except ImportError:
+                raise RuntimeError(f"PyYAML is required to read {path} (pip install pyyaml)")
+            definition = yaml.safe_load(content)
+        else:
+            definition = json.loads(content.decode("utf-8-sig"))
+
+        if isinstance(definition, list):
+            definition = {"sections": definition}
+        sections = definition.get("sections") if isinstance(definition, dict) else None
+        if not isinstance(sections, list) or not sections:
+            raise ValueError(f"Survey definition {path} has no sections")
+        keys = set()
+
+        def check_key(key, what):
+            if not isinstance(key, str) or not key:
+                raise ValueError(f"Survey definition {path}: {what} has no key")
+            if key in keys:
+                raise ValueError(f"Survey definition {path}: key '{key}' of {what} is already used")
+            keys.add(key)
+
+        for si, sec in enumerate(sections):
+            if not isinstance(sec, dict) or not sec.get("title"):
+                raise ValueError(f"Survey definition {path}: section {si} has no title")
+            if not isinstance(sec.get("questions", []), list):
+                raise ValueError(f"Survey definition {path}: questions of section '{sec['title']}' are not a list")
+            check_key(sec.get("key"), f"section '{sec['title']}'")
+            for qi, q in enumerate(sec.get("questions", [])):
+                if not isinstance(q, dict):
+                    raise ValueError(f"Survey definition {path}: question {qi} of section '{sec['title']}' is not an item")
+                check_key(q.get("key"), f"question {qi} ('{q.get('title', '')}') of section '{sec['title']}'")
+        return definition
+
+    @classmethod
+    def compile(cls, definition: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Turn a parsed definition into the cacheable plan: sanitized sections, header
+        image sources and one createItem request per form item.
+        """
+        info = _clean_strings(definition.get("info") or {})
+        sections, headers, items = [], {}, []
+        for sec in definition["sections"]:
+            sec = _clean_strings(dict(sec, description=sec.get("description", ""), questions=sec.get("questions", [])))
+            sections.append(sec)
+            section_items, (header_id, header) = cls.section_items(
+                sec["key"], sec["title"], sec["description"], sec["questions"]
+            )
+            headers[header_id] = list(header)
+            items.extend(section_items)
+        return {
+            "format": cls.FORMAT_VERSION,
+            "info": info,
+            "sections": sections,
+            "headers": headers,
+            "requests": [
+                {"createItem": {"location": {"index": index}, "item": item}}
+                for index, item in enumerate(items)
+            ],
+        }
+
+    @staticmethod
+    def section_items(section_key: str, title: str, description: str,
+                      questions: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], Tuple[str, Tuple[str, str]]]:
+        """
+        One section's form items (page break, header image, questions) with stable item and question IDs.
+
+        Text is used as given. The header image is left without a sourceUri, to be filled
+        in once it is rendered and uploaded, and its altText is the bare title until
+        `form_items`/`create_requests` tag it with the rendered content.
+
+        Returns:
+            tuple: The items, and (header image item ID, (title, description)).
+        """
+        header_id = FormSynchronizer.stable_item_id(f"{section_key}/header")
+        items = [
+            # A) New section
+            {"itemId": FormSynchronizer.stable_item_id(section_key), "pageBreakItem": {}},
+            # B) Header image
+            {"itemId": header_id, "imageItem": {"image": {"altText": title}}}
+        ]
+
+        # C) Questions
+        for q in questions:
+            question_key = q["key"]
+            item = copy.deepcopy({k: v for k, v in q.items() if k != "key"})
+            item["itemId"] = FormSynchronizer.stable_item_id(question_key)
+            if "questionItem" in item:
+                item["questionItem"]["question"]["questionId"] = FormSynchronizer.stable_question_id(question_key)
+            items.append(item)
+        return items, (header_id, (title, description))
+
+    def form_items(self, header_style: Dict[str, Any] = None) -> List[Dict[str, Any]]:
+        """
+        Fresh copies of every form item, in order.
+
+        Args:
+            header_style (dict): Style the header images are rendered with; if given, their
+                                 altText is tagged with the image's cache key (see `header_alt_text`).
+        """
+        items = [copy.deepcopy(req["createItem"]["item"]) for req in self.requests]
+        if header_style is not None:
+            for item in items:
+                if item.get("itemId") in self.headers:
+                    item["imageItem"]["image"]["altText"] = self.header_alt_text(self.headers[item["itemId"]], header_style)
+        return items
+
+    def create_requests(self, header_style: Dict[str, Any] = None) -> List[Dict[str, Any]]:
+        """
+        Fresh copies of the createItem requests that build the survey in an empty form.
+        """
+        return [
+            {"createItem": {"location": {"index": index}, "item": item}}
+            for index, item in enumerate(self.form_items(header_style))
+        ]
+
+    @staticmethod
+    def header_alt_text(header: Tuple[str, str], style: Dict[str, Any]) -> str:
+        """
+        The title, tagged with the header image's cache key (also its Drive file name), so
+        the form diff sees a changed description or style as a changed image.
+        """
+        return f"{header[0]} [hdr_{HeaderImageCache.key(*header, style)[:16]}]"
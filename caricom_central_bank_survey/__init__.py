@@ -0,0 +1,44 @@
+"""
+CARICOM central bank survey generator.
+
+Public classes are imported on first access, so importing the package (or any one
+module of it) does not pull in Google API clients, Pillow, pandas or pyarrow.
+"""
+import importlib
+
+_EXPORTS = {
+    "ApiClientRegistry": "ApiClientRegistry",
+    "CampaignOrchestrator": "CampaignOrchestrator",
+    "CentralBankGoogleFormGenerator": "CentralBankGoogleFormGenerator",
+    "CredentialManager": "CredentialManager",
+    "DistributionJournal": "DistributionJournal",
+    "EmailTemplateManager": "EmailTemplateManager",
+    "FormRequestBatcher": "FormRequestBatcher",
+    "FormSynchronizer": "FormSynchronizer",
+    "GmailSendEngine": "GmailSendEngine",
+    "HeaderImageCache": "HeaderImageCache",
+    "HeaderImagePipeline": "HeaderImagePipeline",
+    "RecipientsManager": "RecipientsManager",
+    "ReminderSystem": "ReminderSystem",
+    "ResponseIndex": "ResponseIndex",
+    "ResponseIngestor": "ResponseIngestor",
+    "ResponseStore": "ResponseStore",
+    "SurveyAnalytics": "SurveyAnalytics",
+    "SurveyDistributor": "SurveyDistributor",
+    "SurveyPlan": "SurveyPlan",
+    "TextSanitizer": "TextSanitizer",
+    "clean_form_text": "TextSanitizer",
+    "create_doc_summary": "DocSummaryGenerator",
+    "get_credentials": "CredentialManager",
+    "get_service": "ApiClientRegistry",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+    globals()[name] = value
+    return value
@@ -1,41 +1,53 @@
 # === Config ===
-python-dotenv
-os
-google-auth
-google-api-python-client
+# Importing this module does no I/O: the .env file is read the first time a setting
+# is looked up, and the IAM check only runs when check_iam_permissions() is called.
+import os
 
-load_dotenv()
+PROJECT_ID = "surveyautomation-465119"
+CREDENTIALS_FILE = r"C:\Users\blang\OneDrive\Google Forms Generator Code\surveyautomation-465119-9f31891e08dc.json"
 
-FORM_ID = os.getenv("FORM_ID")
-CSV_PATH = os.getenv("CSV_PATH")
-GMAIL_CREDENTIALS_PATH = os.getenv("GMAIL_CREDENTIALS_PATH")
+# Settings read from the environment (or .env) on first access
+ENV_SETTINGS = ("FORM_ID", "CSV_PATH", "GMAIL_CREDENTIALS_PATH", "TOKEN_PATH", "SURVEY_PATH")
 
+_dotenv_loaded = False
+
+
+def __getattr__(name):
+    global _dotenv_loaded
+    if name not in ENV_SETTINGS:
+        raise AttributeError(f"module 'config' has no attribute '{name}'")
+    if not _dotenv_loaded:
+        from dotenv import load_dotenv
+        load_dotenv()
+        _dotenv_loaded = True
+    return os.getenv(name)
 
-PROJECT_ID = "surveyautomation-465119"
-CREDENTIALS_FILE = r"C:\Users\blang\OneDrive\Google Forms Generator Code\surveyautomation-465119-9f31891e08dc.json"
 
-# === Authenticate ===
-credentials = service_account.Credentials.from_service_account_file(
-    CREDENTIALS_FILE,
-    scopes=["https://www.googleapis.com/auth/cloud-platform"]
-)
-crm_service = build("cloudresourcemanager", "v1", credentials=credentials)
+# === Check IAM Permissions ===
+def check_iam_permissions(permissions_to_check=("resourcemanager.projects.setIamPolicy",)) -> bool:
+    from google.oauth2 import service_account
+    from caricom_central_bank_survey.ApiClientRegistry import get_service
 
-# === Check IAM Permissions ===config.py
-permissions_to_check = ["resourcemanager.projects.setIamPolicy"]
+    credentials = service_account.Credentials.from_service_account_file(
+        CREDENTIALS_FILE,
+        scopes=["https://www.googleapis.com/auth/cloud-platform"]
+    )
+    crm_service = get_service("cloudresourcemanager", "v1", credentials)
 
-request_body = {
-    "permissions": permissions_to_check
-}
+    request_body = {
+        "permissions": list(permissions_to_check)
+    }
 
-response = crm_service.projects().testIamPermissions(
-    resource=PROJECT_ID,
-    body=request_body
-).execute()
+    response = crm_service.projects().testIamPermissions(
+        resource=PROJECT_ID,
+        body=request_body
+    ).execute()
 
-granted = response.get("permissions", [])
+    granted = response.get("permissions", [])
 
-if "resourcemanager.projects.setIamPolicy" in granted:
-    print("✅ Service account HAS permission to set IAM policy.")
-else:
-    print("❌ Service account is MISSING permission to set IAM policy.")
+    missing = [p for p in permissions_to_check if p not in granted]
+    if not missing:
+        print(f"✅ Service account HAS permission: {', '.join(permissions_to_check)}")
+        return True
+    print(f"❌ Service account is MISSING permission: {', '.join(missing)}")
+    return False
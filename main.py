@@ -1,58 +1,69 @@
-os
-python-dotenv
-
-from caricom_central_bank_survey import CentralBankGoogleFormsGenerator, RecipientsManager, EmailTemplateManager, SurveyDistributor, ReminderSystem
-from auth import get_gmail_credentials
-
-from config import FORM_ID, CSV_PATH
-
-
-
-def main():
-    import os
-    from dotenv import load_dotenv
-    load_dotenv()
-
-    form_id = os.getenv("FORM_ID")#
-    csv_path = os.getenv("CSV_PATH")
-
-    print("🔐 Authenticating Gmail API...")
-    creds = get_gmail_credentials()
-
-    print("📨 Loading recipients...")
-    recipients_mgr = RecipientsManager(csv_path)
-    recipients = recipients_mgr.get_all()
+import sys
+import time
 
-    print("📨 Initializing Survey Distributor...")
-    template_mgr = EmailTemplateManager()
-    distributor = SurveyDistributor(form_id=form_id, creds=creds, template_mgr=template_mgr)
-    distributor.recipients = recipients  # Inject recipients 
+# Everything loaded after this point was loaded for the subcommand (see --import-time)
+_STARTUP_MODULES = set(sys.modules)
+_STARTUP_TIME = time.perf_counter()
 
-    print("🚀 Distributing survey...")
-    distributor.distribute_survey()
+import config
 
-if __name__ == "__main__":
-    main()
+# Package modules and heavy libraries (googleapiclient, Pillow, pandas, pyarrow) are
+# imported inside the functions that use them, so each subcommand loads only its own.
 
 
-import re
-import sys
-
 def safe_sanitize(raw):
-    return re.sub(r"font-family[:;]?.*?;", "", raw or "", flags=re.IGNORECASE)
+    from caricom_central_bank_survey.TextSanitizer import clean_form_text
+    return clean_form_text(raw or "")
+
+def report_imports():
+    """
+    Prints what was imported after startup, by top-level package, for --import-time.
+    """
+    loaded = set(sys.modules) - _STARTUP_MODULES
+    packages = {}
+    for name in loaded:
+        top = name.split(".")[0]
+        if not top.startswith("_") and top not in sys.stdlib_module_names:
+            packages[top] = packages.get(top, 0) + 1
+    print(f"\n⏱️ {time.perf_counter() - _STARTUP_TIME:.2f}s; {len(loaded)} module(s) loaded after startup; by package, standard library omitted:")
+    for top, count in sorted(packages.items(), key=lambda item: (-item[1], item[0])):
+        print(f"  {top:<30} {count:>4}")
+
+def report_api_metrics():
+    """
+    Prints API calls, time and quota per pipeline stage and writes them to
+    API_METRICS_PATH (JSON, or Prometheus text for a .prom file).
+    """
+    from caricom_central_bank_survey.ApiMetrics import metrics
+    summary = metrics.summary()
+    if not summary["calls"]:
+        return
+    print(f"\n📈 {summary['calls']} API call(s), {summary['quota_units']} quota unit(s):")
+    print(f"  {'stage':<14} {'calls':>7} {'api s':>8} {'wall s':>8} {'quota':>8} {'retries':>8} {'errors':>7}")
+    for name, stage in summary["stages"].items():
+        print(f"  {name:<14} {stage['calls']:>7} {stage['api_seconds']:>8.2f} {stage['seconds']:>8.2f} "
+              f"{stage['quota_units']:>8} {stage['retries']:>8} {stage['errors']:>7}")
+    try:
+        print(f"💾 API metrics written to {metrics.export()}")
+    except OSError as e:
+        print(f"❌ Could not write API metrics: {e}")
 
 def load_recipients(path):
+    """
+    Returns the shared recipients source, read once here and reused by every consumer.
+    """
+    from caricom_central_bank_survey import RecipientsManager
     try:
         rm = RecipientsManager(path)
-        recipients = rm.get_all()
-        if not recipients:
+        if not rm.get_all():
             raise ValueError("No recipients found.")
-        return recipients
+        return rm
     except Exception as e:
         print(f"❌ Failed to load recipients: {e}")
-        return []
+        return None
 
 def initialize_generator(csv_path, creds_path, token_path, recipients):
+    from caricom_central_bank_survey import CentralBankGoogleFormGenerator
     try:
         print("🔍 Attempting to initialize CentralBankGoogleFormGenerator...")
         gen = CentralBankGoogleFormGenerator(csv_path, creds_path, token_path)
@@ -63,9 +74,12 @@ def initialize_generator(csv_path, creds_path, token_path, recipients):
         print(f"❌ Generator initialization failed: {e}")
         return None
 
-def build_form(generator):
+def build_form(generator, sync_form_id=None):
     try:
-        form_id = generator.create_centralbank_survey()
+        if sync_form_id:
+            form_id = generator.sync_centralbank_survey(sync_form_id)
+        else:
+            form_id = generator.create_centralbank_survey()
         if not form_id:
             raise ValueError("Form creation failed.")
         return form_id, f"https://docs.google.com/forms/d/{form_id}/viewform"
@@ -73,9 +87,10 @@ def build_form(generator):
         print(f"❌ Form creation error: {e}")
         return None, None
 
-def generate_summary(creds, form_url):
+def generate_summary(creds, form_url, section_definitions=None):
+    from caricom_central_bank_survey import create_doc_summary
     try:
-        doc_url = create_doc_summary(creds, form_url, "CARICOM Survey")
+        doc_url = create_doc_summary(creds, form_url, "CARICOM Survey", section_definitions)
         if not doc_url:
             raise ValueError("Document generation failed.")
         return doc_url
@@ -83,71 +98,172 @@ def generate_summary(creds, form_url):
         print(f"❌ Doc summary error: {e}")
         return None
 
-def dispatch_invitations(form_id, creds, csv_path):
+def dispatch_invitations(form_id, creds, recipients):
+    from caricom_central_bank_survey import EmailTemplateManager, SurveyDistributor
     try:
         template_mgr = EmailTemplateManager()
-        distributor = SurveyDistributor(form_id, creds, template_mgr, csv_path)
+        distributor = SurveyDistributor(form_id, creds, template_mgr, recipients=recipients)
         distributor.distribute_survey()
     except Exception as e:
-        logger.error(f"Survey distribution failed: {e}", exc_info=True)
-        traceback.print_exc()
-		
-def run_distribution_pipeline(form_id, creds):
+        print(f"❌ Survey distribution failed: {e}")
+
+def schedule_reminders(form_id, creds, recipients):
+    from caricom_central_bank_survey import ReminderSystem
+    try:
+        reminder = ReminderSystem(form_id=form_id, creds=creds)
+        reminder.setup_schedule(recipients)
+    except Exception as e:
+        print(f"❌ Reminder scheduling failed: {e}")
+
+def process_reminders(creds, forever=False):
     """
-    Instantiates the email template manager and survey distributor,
-    then sends templated survey invitations via Gmail API.
+    Sends every reminder that is due, once, or keeps doing so when `forever` is set.
     """
-    from email_templates import EmailTemplateManager  # or wherever it lives
-
-    template_mgr = EmailTemplateManager()
+    from caricom_central_bank_survey import ReminderSystem, get_service
+    try:
+        forms = None
+        # Skipping institutions that already responded reads the responses (responses scope)
+        # and looks up the institution question with forms.get (a forms.body scope)
+        if creds.has_scopes(["https://www.googleapis.com/auth/forms.responses.readonly"]) and (
+                creds.has_scopes(["https://www.googleapis.com/auth/forms.body"])
+                or creds.has_scopes(["https://www.googleapis.com/auth/forms.body.readonly"])):
+            forms = get_service("forms", "v1", creds)
+        reminder = ReminderSystem(creds=creds, forms_service=forms)
+        if forever:
+            reminder.run_forever()
+        else:
+            reminder.process_due()
+    except Exception as e:
+        print(f"❌ Reminder processing failed: {e}")
 
-    distributor = SurveyDistributor(
-        form_id=form_id,
-        creds=creds,
-        template_mgr=template_mgr
-    )
-    distributor.distribute_survey()
+def ingest_responses(creds, form_id, section_definitions=None):
+    """
+    Appends responses submitted since the last poll to the local response store and,
+    given the section definitions, folds them into the columnar store used for analysis.
+    """
+    from caricom_central_bank_survey import ResponseIngestor, ResponseStore, get_service
+    try:
+        ingestor = ResponseIngestor(get_service("forms", "v1", creds), form_id)
+        new = ingestor.poll()
+        print(f"📥 {len(new)} new response(s); {ingestor.count} stored in {ingestor.store_path}")
+        if section_definitions:
+            store = ResponseStore(ingestor, section_definitions)
+            store.update()
+            print(f"🗃️ Columnar response store updated: {store.path}")
+    except Exception as e:
+        print(f"❌ Response ingestion failed: {e}")
 
+def summarize_responses(form_ids):
+    """
+    Prints section readiness scores per jurisdiction, one wave per form ID.
+    """
+    from caricom_central_bank_survey import SurveyAnalytics
+    try:
+        import os
+        data_dir = os.getenv("RESPONSES_DIR") or "responses"
+        analytics = SurveyAnalytics.from_stores([os.path.join(data_dir, f"{fid}.arrow") for fid in form_ids])
+        print(f"📊 {analytics.scale.shape[0]} response(s) across {len(analytics.waves)} wave(s)")
+        print(analytics.section_scores().round(1).to_string())
+    except Exception as e:
+        print(f"❌ Response analysis failed: {e}")
 
-def schedule_reminders(recipients):
+def run_campaigns(manifest_path, send=False, batch=False):
+    """
+    Builds the form of every campaign in the manifest in parallel and, once confirmed,
+    sends each campaign's invitations, reporting progress per campaign.
+    """
+    from caricom_central_bank_survey import CampaignOrchestrator
     try:
-        reminder = ReminderSystem()
-        reminder.setup_schedule(recipients)
+        orchestrator = CampaignOrchestrator.from_manifest(manifest_path, token_path=config.TOKEN_PATH)
+        print(f"🚀 Building {len(orchestrator.campaigns)} campaign(s)...")
+        orchestrator.build()
+        orchestrator.report()
+        if not send:
+            return
+        confirm = input("\n🗣  Type 'yes' to send invitations for every built campaign: ").strip().lower()
+        if confirm != "yes":
+            print("🚫 Email distribution canceled.")
+            return
+        orchestrator.distribute(batch=batch)
+        orchestrator.report()
     except Exception as e:
-        print(f"❌ Reminder scheduling failed: {e}")
+        print(f"❌ Campaign run failed: {e}")
 
 # === Main Entry Point ===
-if __name__ == "__main__":
+def main():
+    """
+    Runs the subcommand named on the command line (poll, analyze, campaign, remind) or,
+    without one, the full pipeline: build the form and summary, confirm, send
+    invitations and schedule reminders.
+    """
+    import atexit
+    # Per-stage API call, latency and quota accounting, whichever subcommand ran
+    atexit.register(report_api_metrics)
+
+    if "--import-time" in sys.argv:
+        # Report what the run loaded, after whichever subcommand ran
+        atexit.register(report_imports)
+
+    if len(sys.argv) > 1 and sys.argv[1] == "poll":
+        # python main.py poll: fetch only responses submitted since the last poll
+        generator = initialize_generator(config.CSV_PATH, None, None, [])
+        if generator:
+            ingest_responses(generator.creds, config.FORM_ID, generator.section_definitions)
+        return
+
+    if len(sys.argv) > 1 and sys.argv[1] == "analyze":
+        # python main.py analyze [FORM_ID ...]: readiness scores from the local response stores
+        summarize_responses([a for a in sys.argv[2:] if not a.startswith("--")] or [config.FORM_ID])
+        return
+
+    if len(sys.argv) > 2 and sys.argv[1] == "campaign":
+        # python main.py campaign MANIFEST.json [--send] [--batch]: every survey variant in parallel
+        run_campaigns(sys.argv[2], send="--send" in sys.argv, batch="--batch" in sys.argv)
+        return
+
+    if len(sys.argv) > 1 and sys.argv[1] == "remind":
+        # python main.py remind [--forever]: send due reminders without rebuilding anything
+        from auth import get_gmail_credentials
+        process_reminders(get_gmail_credentials(), forever="--forever" in sys.argv)
+        return
+
     try:
-        csv_path    = CVS_PATH
-        creds_path  = CREDENTIALS_PATH
-        token_path  = TOKEN_PATH
+        csv_path    = config.CSV_PATH
+        creds_path  = config.CREDENTIALS_FILE
+        token_path  = config.TOKEN_PATH
 
         recipients = load_recipients(csv_path)
-        if not recipients: sys.exit()
+        if not recipients: return
 
         generator = initialize_generator(csv_path, creds_path, token_path, recipients)
-        if not generator: exit()
+        if not generator: return
 
-        form_id, form_url = build_form(generator)
-        if not form_id or not form_url: exit()
+        form_id, form_url = build_form(generator, config.FORM_ID if "--sync" in sys.argv else None)
+        if not form_id or not form_url: return
         print(f"✅ Google Form created:\n  {form_url}")
 
-        doc_url = generate_summary(generator.creds, form_url)
-        if not doc_url: exit()
+        doc_url = generate_summary(generator.creds, form_url, generator.section_definitions)
+        if not doc_url: return
         print(f"📄 Summary document created:\n  {doc_url}")
 
         print("\n📨 Ready to distribute to:")
         for entry in recipients:
             print(f"  {entry['institution']}: {', '.join(entry['emails'])}")
+        if recipients.malformed:
+            print(f"⚠️ Skipped {recipients.stats['malformed']} malformed address(es), e.g.:")
+            for path, line, institution, email in recipients.malformed[:10]:
+                print(f"  {path}:{line} {institution}: {email}")
 
         confirm = input("\n🗣  Type 'yes' to send invitations: ").strip().lower()
         if confirm == "yes":
-            dispatch_invitations(form_id, generator.creds, csv_path)
+            dispatch_invitations(form_id, generator.creds, recipients)
+            schedule_reminders(form_id, generator.creds, recipients)
         else:
             print("🚫 Email distribution canceled.")
 
-        schedule_reminders(recipients)
-
     except Exception as e:
         print(f"\n❌ Error running survey pipeline: {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -16,6 +16,7 @@ setup(
         ]
     },
     include_package_data=True,
+    package_data={"caricom_central_bank_survey": ["surveys/*.json"]},
     description="Automated survey distribution tool for CARICOM central banks",
     author="Brian Langrin",
     author_email="brianlangrin@gmail.com"